@@ -0,0 +1,98 @@
+## Compiled Tree Ensemble & Ternary Imputer Parity / Benchmark
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import KNNImputer
+
+from network_security.constant.prediction_pipeline import (
+    FINAL_MODEL_DIR,
+    FINAL_MODEL_FILE_NAME,
+    FINAL_PREPROCESSOR_FILE_NAME,
+)
+from network_security.constant.training_pipeline import (
+    DATA_TRANSFORMATION_IMPUTER_PARAMS,
+    TARGET_COLUMN,
+)
+from network_security.exception.exception import NetworkSecurityException
+from network_security.utils.main_utils.utils import load_object
+from network_security.utils.ml_utils.model.compiled_ensemble import (
+    CompiledTreeEnsemble,
+)
+from network_security.utils.ml_utils.model.ternary_imputer import TernaryKNNImputer
+
+DATA_FILE_PATH = "Network_Data/phisingData.csv"
+BATCH_SIZES = (1, 64, 256, 512, 10_000)
+## share of feature cells blanked out for the imputer comparison
+MISSING_CELL_RATIO = 0.05
+## minimum share of those cells TernaryKNNImputer must impute exactly like KNNImputer
+MIN_IMPUTER_IDENTICAL_SHARE = 0.90
+MIN_BENCHMARK_SECONDS = 1.0
+
+
+def rows_per_second(predict: object, batch: np.ndarray) -> float:
+    predict(batch)
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < MIN_BENCHMARK_SECONDS:
+        predict(batch)
+        calls += 1
+    return calls * len(batch) / elapsed
+
+
+if __name__ == "__main__":
+    try:
+        preprocessor = load_object(FINAL_MODEL_DIR / FINAL_PREPROCESSOR_FILE_NAME)
+        model = load_object(FINAL_MODEL_DIR / FINAL_MODEL_FILE_NAME)
+        compiled_model = CompiledTreeEnsemble.from_estimator(model)
+
+        features = pd.read_csv(DATA_FILE_PATH).drop(columns=[TARGET_COLUMN])
+        x = preprocessor.transform(features)
+
+        ### PARITY ###
+        expected = model.predict(x)
+        actual = compiled_model.predict(x)
+        mismatches = int((expected != actual).sum())
+        print(f"{type(model).__name__}: {mismatches} mismatches over {len(x)} rows")
+        if mismatches:
+            sys.exit(1)
+
+        ### BENCHMARK ###
+        rng = np.random.default_rng(0)
+        for batch_size in BATCH_SIZES:
+            batch = x[rng.integers(0, len(x), batch_size)]
+            sklearn_rate = rows_per_second(model.predict, batch)
+            compiled_rate = rows_per_second(compiled_model.predict, batch)
+            print(
+                f"batch={batch_size:>6}  sklearn={sklearn_rate:>12,.0f} rows/s  "
+                f"compiled={compiled_rate:>12,.0f} rows/s  "
+                f"speedup={compiled_rate / sklearn_rate:.1f}x",
+            )
+
+        ### IMPUTER PARITY ###
+        ## phisingData.csv has no missing values, so blank out cells to compare
+        ## TernaryKNNImputer with KNNImputer on the training matrix itself
+        ## own seed, so the blanked cells do not depend on BATCH_SIZES
+        holes = features.mask(np.random.default_rng(1).random(features.shape) < MISSING_CELL_RATIO)
+        for imputer in (
+            KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS),
+            TernaryKNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS),
+        ):
+            started = time.perf_counter()
+            imputed = imputer.fit(holes).transform(holes)
+            print(f"{type(imputer).__name__}: {time.perf_counter() - started:.2f}s")
+            if isinstance(imputer, KNNImputer):
+                expected = imputed
+        difference = np.abs(expected - imputed)[holes.isna().to_numpy()]
+        identical_share = (difference == 0).mean()
+        print(
+            f"imputed cells={len(difference)}  identical={identical_share:.2%} "
+            f"(minimum {MIN_IMPUTER_IDENTICAL_SHARE:.0%})  "
+            f"mean abs difference={difference.mean():.3f}",
+        )
+        if identical_share < MIN_IMPUTER_IDENTICAL_SHARE:
+            sys.exit(1)
+
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
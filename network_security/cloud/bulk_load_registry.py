@@ -0,0 +1,54 @@
+import struct
+import time
+
+from bson import ObjectId
+
+from network_security.constant.training_pipeline import BULK_LOAD_REGISTRY_COLLECTION_NAME
+
+## states of a bulk load in the registry; only running loads hold back ingestion
+BULK_LOAD_RUNNING = "running"
+BULK_LOAD_COMPLETE = "complete"
+BULK_LOAD_SUPERSEDED = "superseded"
+
+
+def document_id(load_id: int, row: int) -> ObjectId:
+    """
+    Deterministic _id of a bulk loaded CSV row: the load's start time, then the row number.
+
+    Retrying a batch re-sends the same ids, so rows an earlier attempt already
+    inserted are rejected as duplicates instead of doubled. The ids sort by
+    load start time, not by insertion time: batches land out of order, and a
+    load resumed later keeps its original ids, below those of documents
+    inserted since. The registry below keeps the ingestion watermark from
+    passing a load that is still running.
+    """
+    return ObjectId(struct.pack(">IQ", load_id, row))
+
+
+def _registry(collection: object) -> object:
+    return collection.database[BULK_LOAD_REGISTRY_COLLECTION_NAME]
+
+
+def set_bulk_load_status(collection: object, load_id: int, status: str, source: str | None = None) -> None:
+    """Record the state of one bulk load into collection, in the same database."""
+    fields = {"collection": collection.name, "load_id": load_id, "status": status, "updated_at": time.time()}
+    if source is not None:
+        fields["source"] = source
+    _registry(collection).update_one(
+        {"_id": f"{collection.name}/{load_id}"}, {"$set": fields}, upsert=True,
+    )
+
+
+def running_bulk_load_floor(collection: object) -> ObjectId | None:
+    """
+    Smallest _id a running bulk load into collection can still insert, or None.
+
+    Documents at or above it may sit next to ids the load has not written yet,
+    so an _id watermark must stay below it until the load is complete.
+    """
+    running = _registry(collection).find_one(
+        {"collection": collection.name, "status": BULK_LOAD_RUNNING},
+        {"load_id": 1},
+        sort=[("load_id", 1)],
+    )
+    return None if running is None else document_id(running["load_id"], 0)
@@ -0,0 +1,127 @@
+import importlib.util
+import os
+import sys
+import threading
+from urllib.parse import quote_plus
+
+import certifi
+import pymongo
+from dotenv import load_dotenv
+from pymongo.server_api import ServerApi
+
+from network_security.constant.training_pipeline import (
+    MONGO_DB_CLUSTER_HOST,
+    MONGO_DB_COMPRESSORS,
+    MONGO_DB_CONNECT_TIMEOUT_MS,
+    MONGO_DB_MAX_POOL_SIZE,
+    MONGO_DB_MIN_POOL_SIZE,
+    MONGO_DB_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_DB_SOCKET_TIMEOUT_MS,
+    MONGO_DB_URL_ENV_KEY,
+)
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+
+## process-wide client and the pid it was created in, see get_mongo_client
+_mongo_client: pymongo.MongoClient | None = None
+_mongo_client_pid: int | None = None
+_mongo_client_lock = threading.Lock()
+## python module each wire compressor needs; zlib is in the standard library
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def get_mongo_db_url() -> str:
+    """MONGO_DB_URL if set, else the Atlas URL for MONGO_DB_USERNAME / MONGO_DB_PASSWORD."""
+    load_dotenv()
+    mongo_db_url = os.getenv(MONGO_DB_URL_ENV_KEY)
+    if mongo_db_url:
+        return mongo_db_url
+    username = quote_plus(os.getenv("MONGO_DB_USERNAME"))
+    password = quote_plus(os.getenv("MONGO_DB_PASSWORD"))
+    return f"mongodb+srv://{username}:{password}@{MONGO_DB_CLUSTER_HOST}/?retryWrites=true&w=majority&appName=Cluster0"
+
+
+def _installed_compressors() -> list[str]:
+    """MONGO_DB_COMPRESSORS whose codec module is installed, in order of preference."""
+    return [
+        compressor
+        for compressor in MONGO_DB_COMPRESSORS.split(",")
+        if importlib.util.find_spec(_COMPRESSOR_MODULES.get(compressor, compressor)) is not None
+    ]
+
+
+def _client_options(mongo_db_url: str) -> dict:
+    options = {
+        "maxPoolSize": MONGO_DB_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_DB_MIN_POOL_SIZE,
+        "connectTimeoutMS": MONGO_DB_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_DB_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_DB_SOCKET_TIMEOUT_MS,
+        ## no background connection until the first operation, so creating the
+        ## client is cheap and a forked child never inherits live sockets
+        "connect": False,
+    }
+    compressors = _installed_compressors()
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    if mongo_db_url.startswith("mongodb+srv://"):
+        ## Atlas requires TLS; a plain local mongod must not get a CA file, it would enable TLS
+        options["tlsCAFile"] = certifi.where()
+        ## pin the Atlas stable API version, as the connection used before the shared client
+        options["server_api"] = ServerApi("1")
+    return options
+
+
+def _create_mongo_client() -> pymongo.MongoClient:
+    mongo_db_url = get_mongo_db_url()
+    return pymongo.MongoClient(mongo_db_url, **_client_options(mongo_db_url))
+
+
+def get_mongo_client() -> pymongo.MongoClient:
+    """
+    Return the process-wide pooled MongoClient, creating it on first use.
+
+    Every thread of the process shares the client and its connection pool, so
+    TLS handshakes and SRV lookups are paid once. MongoClient must not be used
+    across fork(): a child process (e.g. a forked server worker) gets a fresh
+    client of its own instead of the parent's.
+    """
+    global _mongo_client, _mongo_client_pid
+    try:
+        pid = os.getpid()
+        if _mongo_client is not None and _mongo_client_pid == pid:
+            return _mongo_client
+        with _mongo_client_lock:
+            if _mongo_client is None or _mongo_client_pid != pid:
+                _mongo_client = _create_mongo_client()
+                _mongo_client_pid = pid
+                logging.info(f"Created the MongoDB client of process {pid}")
+            return _mongo_client
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def get_mongo_collection(database_name: str, collection_name: str) -> object:
+    return get_mongo_client()[database_name][collection_name]
+
+
+def close_mongo_client() -> None:
+    """Close the client of this process; the next get_mongo_client() creates a new one."""
+    global _mongo_client, _mongo_client_pid
+    with _mongo_client_lock:
+        if _mongo_client is not None and _mongo_client_pid == os.getpid():
+            _mongo_client.close()
+        _mongo_client, _mongo_client_pid = None, None
+
+
+def _reset_after_fork() -> None:
+    ## the lock may have been held by another thread at fork time
+    global _mongo_client, _mongo_client_pid, _mongo_client_lock
+    _mongo_client, _mongo_client_pid = None, None
+    _mongo_client_lock = threading.Lock()
+## python module each wire compressor needs; zlib is in the standard library
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -2,11 +2,11 @@ import sys
 
 import numpy as np
 import pandas as pd
-from sklearn.impute import KNNImputer
 from sklearn.pipeline import Pipeline
 
 from network_security.constant.training_pipeline import (
     DATA_TRANSFORMATION_IMPUTER_PARAMS,
+    SCHEMA_FILE_PATH,
     TARGET_COLUMN,
 )
 from network_security.entity.artifact_entity import (
@@ -16,7 +16,11 @@ from network_security.entity.artifact_entity import (
 from network_security.entity.config_entity import DataTransformationConfig
 from network_security.exception.exception import NetworkSecurityException
 from network_security.logging.logger import logging
+from network_security.utils.main_utils.artifact_format import read_dataframe
+from network_security.utils.main_utils.schema_types import SchemaTypes
 from network_security.utils.main_utils.utils import save_numpy_array_data, save_object
+from network_security.utils.main_utils.write_behind import WriteBehind, persist
+from network_security.utils.ml_utils.model.ternary_imputer import TernaryKNNImputer
 
 
 class DataTransformation:
@@ -24,6 +28,7 @@ class DataTransformation:
         self,
         data_validation_artifact: DataValidationArtifact,
         data_transformation_config: DataTransformationConfig,
+        write_behind: WriteBehind | None = None,
     ) -> None:
         try:
             self.data_validation_artifact: DataValidationArtifact = (
@@ -32,20 +37,23 @@ class DataTransformation:
             self.data_transformation_config: DataTransformationConfig = (
                 data_transformation_config
             )
+            self._schema_types = SchemaTypes(SCHEMA_FILE_PATH)
+            self.write_behind = write_behind
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    @staticmethod
-    def read_data(file_path: str) -> pd.DataFrame:
+    def read_data(self, file_path: str) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return read_dataframe(
+                file_path, self.data_transformation_config.artifact_format, self._schema_types,
+            )
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
     def get_data_transformer_object(self) -> Pipeline:
         """
-        It initialises a KNNImputer object with the parameters specified in the training_pipeline.py file
-        and returns a Pipeline object with the KNNImputer object as the first step.
+        It initialises a TernaryKNNImputer object with the parameters specified in the training_pipeline.py file
+        and returns a Pipeline object with the TernaryKNNImputer object as the first step.
 
         Args:
           cls: DataTransformation
@@ -58,9 +66,9 @@ class DataTransformation:
             "Entered get_data_trnasformer_object method of Trnasformation class",
         )
         try:
-            imputer: KNNImputer = KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS)
+            imputer: TernaryKNNImputer = TernaryKNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS)
             logging.info(
-                f"Initialise KNNImputer with {DATA_TRANSFORMATION_IMPUTER_PARAMS}",
+                f"Initialise TernaryKNNImputer with {DATA_TRANSFORMATION_IMPUTER_PARAMS}",
             )
             processor: Pipeline = Pipeline([("imputer", imputer)])
             return processor
@@ -73,20 +81,24 @@ class DataTransformation:
         )
         try:
             logging.info("Starting data transformation")
-            train_df = DataTransformation.read_data(
-                self.data_validation_artifact.valid_train_file_path,
-            )
-            test_df = DataTransformation.read_data(
-                self.data_validation_artifact.valid_test_file_path,
-            )
+            train_df = self.data_validation_artifact.valid_train_dataframe
+            if train_df is None:
+                train_df = self.read_data(
+                    self.data_validation_artifact.valid_train_file_path,
+                )
+            test_df = self.data_validation_artifact.valid_test_dataframe
+            if test_df is None:
+                test_df = self.read_data(
+                    self.data_validation_artifact.valid_test_file_path,
+                )
 
             ## training dataframe
-            input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN])
             target_feature_train_df = train_df[TARGET_COLUMN]
             target_feature_train_df = target_feature_train_df.replace(-1, 0)
 
             # testing dataframe
-            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN])
             target_feature_test_df = test_df[TARGET_COLUMN]
             target_feature_test_df = target_feature_test_df.replace(-1, 0)
 
@@ -110,24 +122,25 @@ class DataTransformation:
             ]
 
             # save numpy array data
-            save_numpy_array_data(
+            persist(
+                self.write_behind,
+                save_numpy_array_data,
                 self.data_transformation_config.transformed_train_file_path,
-                array=train_arr,
+                train_arr,
             )
-            save_numpy_array_data(
+            persist(
+                self.write_behind,
+                save_numpy_array_data,
                 self.data_transformation_config.transformed_test_file_path,
-                array=test_arr,
+                test_arr,
             )
-            save_object(
+            persist(
+                self.write_behind,
+                save_object,
                 self.data_transformation_config.transformed_object_file_path,
                 preprocessor_object,
             )
 
-            save_object(
-                "final_model/preprocessor.pkl",
-                preprocessor_object,
-            )
-
             # preparing artifacts
 
             data_transformation_artifact = DataTransformationArtifact(
@@ -135,6 +148,10 @@ class DataTransformation:
                 transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
                 transformed_test_file_path=self.data_transformation_config.transformed_test_file_path,
             )
+            if self.write_behind is not None:
+                data_transformation_artifact.transformed_object = preprocessor_object
+                data_transformation_artifact.transformed_train_array = train_arr
+                data_transformation_artifact.transformed_test_array = test_arr
             return data_transformation_artifact
 
         except Exception as e:
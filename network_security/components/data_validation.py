@@ -12,7 +12,13 @@ from network_security.entity.artifact_entity import (
 from network_security.entity.config_entity import DataValidationConfig
 from network_security.exception.exception import NetworkSecurityException
 from network_security.logging.logger import logging
+from network_security.utils.main_utils.artifact_format import (
+    read_dataframe,
+    write_dataframe,
+)
+from network_security.utils.main_utils.schema_types import SchemaTypes
 from network_security.utils.main_utils.utils import read_yaml_file, write_yaml_file
+from network_security.utils.main_utils.write_behind import WriteBehind, persist
 
 
 class DataValidation:
@@ -20,19 +26,23 @@ class DataValidation:
         self,
         data_ingestion_artifact: DataIngestionArtifact,
         data_validation_config: DataValidationConfig,
+        write_behind: WriteBehind | None = None,
     ) -> None:
         try:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
+            self.write_behind = write_behind
             self._schema_config = read_yaml_file(SCHEMA_FILE_PATH)
             self._numerical_columns = self._schema_config.get("numerical_columns", [])
+            self._schema_types = SchemaTypes(SCHEMA_FILE_PATH)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    @staticmethod
-    def read_data(file_path: str) -> pd.DataFrame:
+    def read_data(self, file_path: str) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return read_dataframe(
+                file_path, self.data_validation_config.artifact_format, self._schema_types,
+            )
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
@@ -106,9 +116,13 @@ class DataValidation:
             train_file_path = self.data_ingestion_artifact.trained_file_path
             test_file_path = self.data_ingestion_artifact.test_file_path
 
-            ## Read the data from train and test
-            train_dataframe = DataValidation.read_data(train_file_path)
-            test_dataframe = DataValidation.read_data(test_file_path)
+            ## Read the data from train and test, unless ingestion handed it over
+            train_dataframe = self.data_ingestion_artifact.train_dataframe
+            if train_dataframe is None:
+                train_dataframe = self.read_data(train_file_path)
+            test_dataframe = self.data_ingestion_artifact.test_dataframe
+            if test_dataframe is None:
+                test_dataframe = self.read_data(test_file_path)
 
             ## Validate number of columns
             status = self.validate_number_of_columns(dataframe=train_dataframe)
@@ -131,29 +145,34 @@ class DataValidation:
             ## Check data drift
             status = self.detect_dataset_drift(
                 base_df=train_dataframe, current_df=test_dataframe)
-            dir_path = Path(self.data_validation_config.valid_train_file_path).parent
-            dir_path.mkdir(parents=True, exist_ok=True)
 
-            train_dataframe.to_csv(
+            persist(
+                self.write_behind,
+                write_dataframe,
                 self.data_validation_config.valid_train_file_path,
-                index=False,
-                header=True,
+                train_dataframe,
+                self.data_validation_config.artifact_format,
             )
 
-            test_dataframe.to_csv(
+            persist(
+                self.write_behind,
+                write_dataframe,
                 self.data_validation_config.valid_test_file_path,
-                index=False,
-                header=True,
+                test_dataframe,
+                self.data_validation_config.artifact_format,
             )
 
             data_validation_artifact = DataValidationArtifact(
                 validation_status=status,
-                valid_train_file_path=self.data_ingestion_artifact.trained_file_path,
-                valid_test_file_path=self.data_ingestion_artifact.test_file_path,
+                valid_train_file_path=self.data_validation_config.valid_train_file_path,
+                valid_test_file_path=self.data_validation_config.valid_test_file_path,
                 invalid_train_file_path=None,
                 invalid_test_file_path=None,
                 drift_report_file_path=self.data_validation_config.drift_report_file_path,
             )
+            if self.write_behind is not None:
+                data_validation_artifact.valid_train_dataframe = train_dataframe
+                data_validation_artifact.valid_test_dataframe = test_dataframe
             return data_validation_artifact
         except Exception as e:
             raise NetworkSecurityException(e, sys)
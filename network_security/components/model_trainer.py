@@ -1,8 +1,9 @@
+import functools
+import shutil
 import sys
+import time
 from pathlib import Path
 
-import dagshub
-import mlflow
 from sklearn.ensemble import (
     AdaBoostClassifier,
     GradientBoostingClassifier,
@@ -11,6 +12,15 @@ from sklearn.ensemble import (
 from sklearn.linear_model import LogisticRegression
 from sklearn.tree import DecisionTreeClassifier
 
+from network_security.constant.prediction_pipeline import (
+    FINAL_COMPILED_MODEL_FILE_NAME,
+    FINAL_MODEL_CURRENT_FILE_NAME,
+    FINAL_MODEL_DIR,
+    FINAL_MODEL_FILE_NAME,
+    FINAL_MODEL_SHARED_ARRAY_MIN_BYTES,
+    FINAL_MODEL_VERSIONS_DIR,
+    FINAL_PREPROCESSOR_FILE_NAME,
+)
 from network_security.entity.artifact_entity import (
     DataTransformationArtifact,
     ModelTrainerArtifact,
@@ -21,19 +31,34 @@ from network_security.logging.logger import logging
 from network_security.utils.main_utils.utils import (
     load_numpy_array_data,
     load_object,
+    read_version_marker,
     save_object,
+    save_shared_object,
+    write_version_marker,
 )
 from network_security.utils.ml_utils.evaluation.evaluation import evaluate_models
 from network_security.utils.ml_utils.metric.classification_metric import (
     get_classification_score,
 )
+from network_security.utils.ml_utils.model.compiled_ensemble import (
+    CompiledTreeEnsemble,
+    compile_model,
+)
 from network_security.utils.ml_utils.model.estimator import NetworkModel
 
-dagshub.init(
-    repo_owner="GoJo-Rika",
-    repo_name="Network-Security-System-MLOps-Project",
-    mlflow=True,
-)
+
+@functools.cache
+def _init_mlflow_tracking() -> object:
+    """Connect mlflow to the DagsHub repository on first use and return the mlflow module."""
+    import dagshub
+    import mlflow
+
+    dagshub.init(
+        repo_owner="GoJo-Rika",
+        repo_name="Network-Security-System-MLOps-Project",
+        mlflow=True,
+    )
+    return mlflow
 
 
 class ModelTrainer:
@@ -49,6 +74,7 @@ class ModelTrainer:
             raise NetworkSecurityException(e, sys)
 
     def track_mlflow(self, best_model: object, classificationmetric: object) -> None:
+        mlflow = _init_mlflow_tracking()
         with mlflow.start_run():
             f1_score = classificationmetric.f1_score
             precision_score = classificationmetric.precision_score
@@ -132,17 +158,18 @@ class ModelTrainer:
 
         self.track_mlflow(best_model, classification_test_metric)
 
-        preprocessor = load_object(
-            file_path=self.data_transformation_artifact.transformed_object_file_path,
-        )
+        preprocessor = self.data_transformation_artifact.transformed_object
+        if preprocessor is None:
+            preprocessor = load_object(
+                file_path=self.data_transformation_artifact.transformed_object_file_path,
+            )
         model_dir_path = Path(self.model_trainer_config.trained_model_file_path).parent
         model_dir_path.mkdir(parents=True, exist_ok=True)
 
         network_model = NetworkModel(preprocessor=preprocessor, model=best_model)
-        save_object(self.model_trainer_config.trained_model_file_path, obj=NetworkModel)
+        save_object(self.model_trainer_config.trained_model_file_path, obj=network_model)
 
-        ## Model pusher
-        save_object("final_model/model.pkl", best_model)
+        self.push_model(preprocessor, best_model)
 
         ## Model Trainer Artifact
         model_trainer_artifact = ModelTrainerArtifact(
@@ -153,6 +180,47 @@ class ModelTrainer:
         logging.info(f"Model trainer artifact: {model_trainer_artifact}")
         return model_trainer_artifact
 
+    def push_model(self, preprocessor: object, model: object) -> str:
+        """
+        Publish preprocessor and model as a new version of final_model/.
+
+        All files of a push go to a fresh versions/<version>/ directory that is
+        never written again; switching the current marker file last makes the
+        whole set visible at once, so serving never loads a mix of two pushes.
+        The large arrays (KNN donors, tree nodes) become .npy files that serving
+        workers memory map. Versions other than the new and the replaced one
+        are deleted.
+        """
+        version = f"model-{time.time_ns()}"
+        versions_dir = FINAL_MODEL_DIR / FINAL_MODEL_VERSIONS_DIR
+        version_dir = versions_dir / version
+        version_dir.mkdir(parents=True)
+
+        compiled_model = compile_model(model)
+        if isinstance(compiled_model, CompiledTreeEnsemble):
+            save_shared_object(
+                version_dir / FINAL_COMPILED_MODEL_FILE_NAME,
+                compiled_model,
+                FINAL_MODEL_SHARED_ARRAY_MIN_BYTES,
+            )
+        save_shared_object(
+            version_dir / FINAL_PREPROCESSOR_FILE_NAME,
+            preprocessor,
+            FINAL_MODEL_SHARED_ARRAY_MIN_BYTES,
+        )
+        save_object(version_dir / FINAL_MODEL_FILE_NAME, model)
+
+        current_file_path = FINAL_MODEL_DIR / FINAL_MODEL_CURRENT_FILE_NAME
+        previous_version = read_version_marker(current_file_path)
+        write_version_marker(current_file_path, version)
+        logging.info(f"Published model {version}, replacing {previous_version}")
+
+        ## the replaced version may still be loading in a server that read the old marker
+        for old_version_dir in versions_dir.iterdir():
+            if old_version_dir.name not in (version, previous_version):
+                shutil.rmtree(old_version_dir, ignore_errors=True)
+        return version
+
     def initiate_model_trainer(self) -> ModelTrainerArtifact:
         try:
             train_file_path = (
@@ -162,9 +230,13 @@ class ModelTrainer:
                 self.data_transformation_artifact.transformed_test_file_path
             )
 
-            # Loading training array and testing array
-            train_arr = load_numpy_array_data(train_file_path)
-            test_arr = load_numpy_array_data(test_file_path)
+            # Loading training array and testing array, unless transformation handed them over
+            train_arr = self.data_transformation_artifact.transformed_train_array
+            if train_arr is None:
+                train_arr = load_numpy_array_data(train_file_path)
+            test_arr = self.data_transformation_artifact.transformed_test_array
+            if test_arr is None:
+                test_arr = load_numpy_array_data(test_file_path)
 
             x_train, y_train, x_test, y_test = (
                 train_arr[:, :-1],
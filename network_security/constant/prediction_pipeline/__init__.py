@@ -0,0 +1,132 @@
+from pathlib import Path
+
+"""
+defining common constant variable for prediction pipeline
+"""
+FINAL_MODEL_DIR = Path("final_model")
+FINAL_MODEL_FILE_NAME: str = "model.pkl"
+FINAL_PREPROCESSOR_FILE_NAME: str = "preprocessor.pkl"
+## tree ensembles exported as flat node arrays next to model.pkl
+FINAL_COMPILED_MODEL_FILE_NAME: str = "compiled_model.pkl"
+## arrays at least this large are stored as memory mapped .npy files
+FINAL_MODEL_SHARED_ARRAY_MIN_BYTES: int = 64 * 1024
+## every push goes to its own final_model/versions/<version>/ directory; the
+## current marker file is switched last and names the version in service
+FINAL_MODEL_VERSIONS_DIR: str = "versions"
+FINAL_MODEL_CURRENT_FILE_NAME: str = "current"
+
+
+"""
+Model serving related constant start with MODEL_SERVING VAR NAME
+"""
+## how often the model holder checks final_model/ for a newly pushed model
+MODEL_SERVING_RELOAD_POLL_INTERVAL: float = 5.0
+## serve tree ensembles through the array based CompiledTreeEnsemble evaluator
+MODEL_SERVING_USE_COMPILED_MODEL: bool = True
+## larger batches go to the sklearn model; it overtakes the compiled one between 256 and 512 rows
+MODEL_SERVING_COMPILED_MODEL_MAX_ROWS: int = 256
+## synthetic rows every newly loaded model scores before it serves traffic
+MODEL_SERVING_WARMUP_ROWS: int = 256
+## uvicorn worker processes; they share the memory mapped model arrays
+MODEL_SERVING_WORKERS: int = 1
+## Retry-After seconds of the 503 answered to predictions sent before the model is ready
+MODEL_SERVING_RETRY_AFTER_SECONDS: int = 5
+
+
+"""
+Prediction output related constant start with PREDICTION VAR NAME
+"""
+PREDICTION_COLUMN_NAME: str = "predicted_column"
+## rows parsed and scored per chunk by the streaming /predict endpoint
+PREDICTION_STREAM_CHUNK_SIZE: int = 10_000
+PREDICTION_STREAM_MAX_CHUNK_SIZE: int = 100_000
+PREDICTION_STREAM_MEDIA_TYPES: dict = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+"""
+Micro batching related constant start with MICRO_BATCH VAR NAME
+"""
+## single-row JSON requests are coalesced into one predict call per batch
+MICRO_BATCH_MAX_SIZE: int = 64
+MICRO_BATCH_MAX_WAIT_SECONDS: float = 0.005
+## batches scored at once; one more than the json pool keeps it busy without a backlog
+MICRO_BATCH_MAX_CONCURRENT: int = 2
+
+
+"""
+Inference executor related constant start with INFERENCE_EXECUTOR VAR NAME
+"""
+## "thread" or "process"; overridable with the INFERENCE_EXECUTOR_KIND env variable
+INFERENCE_EXECUTOR_KIND: str = "thread"
+## pool sizes, overridable with INFERENCE_UPLOAD_WORKERS / INFERENCE_JSON_WORKERS
+INFERENCE_UPLOAD_WORKERS: int = 2
+INFERENCE_JSON_WORKERS: int = 1
+
+
+"""
+Prediction cache related constant start with PREDICTION_CACHE VAR NAME
+"""
+## predictions kept per encoded feature row; 0 disables the cache
+PREDICTION_CACHE_MAX_ENTRIES: int = 100_000
+
+
+"""
+Prediction output store related constant start with PREDICTION_OUTPUT VAR NAME
+"""
+PREDICTION_OUTPUT_DIR = Path("prediction_output")
+## rows shown per page of the /predict HTML view
+PREDICTION_OUTPUT_PAGE_SIZE: int = 100
+## retention: whichever limit is hit first evicts the oldest outputs
+PREDICTION_OUTPUT_MAX_FILES: int = 200
+PREDICTION_OUTPUT_MAX_BYTES: int = 1024 * 1024 * 1024
+PREDICTION_OUTPUT_TTL_SECONDS: float = 24 * 60 * 60
+
+
+"""
+Batch prediction related constant start with BATCH_PREDICTION VAR NAME
+"""
+BATCH_PREDICTION_DIR = Path("prediction_output") / "batch"
+BATCH_PREDICTION_MANIFEST_FILE_NAME: str = "manifest.yaml"
+## csv inputs are split into byte ranges so every worker parses its own shard
+BATCH_PREDICTION_SHARD_BYTES: int = 32 * 1024 * 1024
+## mongo inputs are split into _id ranges of this many documents
+BATCH_PREDICTION_SHARD_ROWS: int = 500_000
+## documents per cursor round trip while a worker reads its _id range
+BATCH_PREDICTION_CURSOR_BATCH_SIZE: int = 10_000
+## "csv" or "parquet"
+BATCH_PREDICTION_OUTPUT_FORMAT: str = "csv"
+
+
+"""
+Serving metrics related constant start with METRICS VAR NAME
+"""
+METRICS_NAMESPACE: str = "network_security"
+## histogram upper bounds in seconds for every /predict phase
+METRICS_LATENCY_BUCKETS: tuple = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+METRICS_ROWS_BUCKETS: tuple = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+"""
+Prediction upload related constant start with PREDICTION_UPLOAD VAR NAME
+"""
+## decoder picked from the content type of the uploaded file part
+PREDICTION_UPLOAD_MEDIA_TYPES: dict = {
+    "text/csv": "csv",
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/x-npy": "npy",
+}
+## fallback for generic content types such as application/octet-stream
+PREDICTION_UPLOAD_SUFFIXES: dict = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrows": "arrow",
+    ".arrow": "arrow",
+    ".npy": "npy",
+}
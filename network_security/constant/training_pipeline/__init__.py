@@ -15,6 +15,31 @@ TEST_FILE_NAME: str = "test.csv"
 SCHEMA_FILE_PATH = Path("data_schema") / "schema.yaml"
 SAVED_MODEL_DIR = Path("saved_models")
 MODEL_FILE_NAME = "model.pkl"
+## on-disk format of the tabular stage artifacts (feature store, train/test splits):
+## "parquet", "npz" (one compressed .npy per column) or "csv"; the file suffix follows it
+DATA_ARTIFACT_FORMAT: str = "parquet"
+## stages pass their outputs to the next stage in memory and persist them in the
+## background; False makes every stage write synchronously and reload from disk
+IN_MEMORY_ARTIFACT_HANDOFF: bool = True
+## background threads writing artifacts when IN_MEMORY_ARTIFACT_HANDOFF is set
+ARTIFACT_WRITE_BEHIND_WORKERS: int = 2
+
+
+"""
+MongoDB client related constant start with MONGO_DB VAR NAME
+"""
+## a full connection string in this environment variable (e.g. a local mongod)
+## replaces the Atlas URL built from MONGO_DB_USERNAME / MONGO_DB_PASSWORD
+MONGO_DB_URL_ENV_KEY: str = "MONGO_DB_URL"
+MONGO_DB_CLUSTER_HOST: str = "cluster0.l5ee6dv.mongodb.net"
+## connections per process, shared by every thread using the client
+MONGO_DB_MAX_POOL_SIZE: int = 16
+MONGO_DB_MIN_POOL_SIZE: int = 0
+MONGO_DB_CONNECT_TIMEOUT_MS: int = 10_000
+MONGO_DB_SERVER_SELECTION_TIMEOUT_MS: int = 10_000
+MONGO_DB_SOCKET_TIMEOUT_MS: int = 120_000
+## wire compression in order of preference; codecs whose module is not installed are left out
+MONGO_DB_COMPRESSORS: str = "zstd,snappy,zlib"
 
 
 """
@@ -23,9 +48,45 @@ Data Ingestion related constant start with DATA_INGESTION VAR NAME
 DATA_INGESTION_COLLECTION_NAME: str = "NetworkData"
 DATA_INGESTION_DATABASE_NAME: str = "TEST_DB"
 DATA_INGESTION_DIR_NAME: str = "data_ingestion"
+## append-only feature store kept across pipeline runs, one partition per ingestion
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
+DATA_INGESTION_FEATURE_STORE_MANIFEST_FILE_NAME: str = "manifest.yaml"
+## only documents above the stored high-water mark of this key are fetched
+DATA_INGESTION_WATERMARK_KEY: str = "_id"
+## False re-exports the whole collection into a fresh feature store
+DATA_INGESTION_INCREMENTAL: bool = True
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATION: float = 0.2
+## rows are placed in train or test by a keyed hash; another 16 character key reshuffles the split
+DATA_INGESTION_SPLIT_HASH_KEY: str = "network-security"
+## columns hashed to place a row; None hashes the whole row, so duplicate rows of a
+## partition never straddle the split (see hash_split for stratification across partitions)
+DATA_INGESTION_SPLIT_KEY_COLUMNS: list[str] | None = None
+## keep the TARGET_COLUMN class balance of every feature store partition in both splits
+DATA_INGESTION_SPLIT_STRATIFY: bool = True
+## documents per cursor round trip, also the unit the column buffers are filled in
+DATA_INGESTION_CURSOR_BATCH_SIZE: int = 10_000
+## concurrent range reads of the collection; 1 reads it through a single cursor
+DATA_INGESTION_READ_PARALLELISM: int = 4
+## field the collection is split into ranges on
+DATA_INGESTION_PARTITION_KEY: str = "_id"
+## rows per feature store partition file; one partition is held in memory per reader
+DATA_INGESTION_PARTITION_ROWS: int = 250_000
+
+
+"""
+Bulk load related constant start with BULK_LOAD VAR NAME
+"""
+## raw CSV pushed into the ingestion collection by push_data.py
+BULK_LOAD_FILE_PATH = Path("Network_Data") / FILE_NAME
+BULK_LOAD_DIR = Path("bulk_load")
+## CSV rows read per chunk, each chunk is one unordered insert_many
+BULK_LOAD_BATCH_SIZE: int = 5_000
+## insert_many calls in flight at once
+BULK_LOAD_WRITERS: int = 4
+## collection (in the ingestion database) recording running and finished loads;
+## incremental ingestion does not advance its _id watermark past a running one
+BULK_LOAD_REGISTRY_COLLECTION_NAME: str = "bulk_loads"
 
 
 """
@@ -71,3 +132,14 @@ MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD: float = 0.05
 ## The bucket name should be unique globally and cannot be changed
 ## Make a s3 bucket and change it below.
 TRAINING_BUCKET_NAME = "demo-networksecurity"
+
+
+"""
+Training job scheduler related constant start with TRAINING_JOB VAR NAME
+"""
+## training runs that may execute at once; further /train submissions are queued
+TRAINING_JOB_MAX_CONCURRENT: int = 1
+## training processes run at a lower CPU priority than the API
+TRAINING_JOB_NICENESS: int = 10
+## finished jobs kept in memory for /train/{job_id}
+TRAINING_JOB_HISTORY_SIZE: int = 100
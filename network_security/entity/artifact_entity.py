@@ -1,10 +1,21 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+
+## in-memory handles are set when the pipeline hands artifacts over without
+## reloading them; the next stage falls back to the file paths when they are None
+def _in_memory() -> object:
+    return field(default=None, repr=False, compare=False)
 
 
 @dataclass
 class DataIngestionArtifact:
     trained_file_path: str
     test_file_path: str
+    train_dataframe: pd.DataFrame | None = _in_memory()
+    test_dataframe: pd.DataFrame | None = _in_memory()
 
 
 @dataclass
@@ -15,6 +26,8 @@ class DataValidationArtifact:
     invalid_train_file_path: str
     invalid_test_file_path: str
     drift_report_file_path: str
+    valid_train_dataframe: pd.DataFrame | None = _in_memory()
+    valid_test_dataframe: pd.DataFrame | None = _in_memory()
 
 
 @dataclass
@@ -22,6 +35,9 @@ class DataTransformationArtifact:
     transformed_object_file_path: str
     transformed_train_file_path: str
     transformed_test_file_path: str
+    transformed_object: object = _in_memory()
+    transformed_train_array: np.ndarray | None = _in_memory()
+    transformed_test_array: np.ndarray | None = _in_memory()
 
 
 @dataclass
@@ -36,3 +52,20 @@ class ModelTrainerArtifact:
     trained_model_file_path: str
     train_metric_artifact: ClassificationMetricArtifact
     test_metric_artifact: ClassificationMetricArtifact
+
+
+@dataclass
+class BatchPredictionArtifact:
+    output_dir: str
+    manifest_file_path: str
+    shard_count: int
+    scored_shard_count: int
+    total_rows: int
+
+
+@dataclass
+class BulkLoadArtifact:
+    manifest_file_path: str
+    batch_count: int
+    loaded_batch_count: int
+    total_rows: int
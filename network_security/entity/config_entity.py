@@ -1,10 +1,8 @@
+import os
 from datetime import datetime
 from pathlib import Path
 
-from network_security.constant import training_pipeline
-
-print(training_pipeline.PIPELINE_NAME)
-print(training_pipeline.ARTIFACT_DIR)
+from network_security.constant import prediction_pipeline, training_pipeline
 
 
 class TrainingPipelineConfig:
@@ -17,6 +15,13 @@ class TrainingPipelineConfig:
         self.artifact_dir = Path(self.artifact_name) / timestamp_str
         self.model_dir = Path("final_model")
         self.timestamp: str = timestamp_str
+        self.in_memory_handoff: bool = training_pipeline.IN_MEMORY_ARTIFACT_HANDOFF
+        self.write_behind_workers: int = training_pipeline.ARTIFACT_WRITE_BEHIND_WORKERS
+
+
+def _artifact_file_name(file_name: str) -> str:
+    ## the suffix of a tabular stage artifact is the name of its format
+    return str(Path(file_name).with_suffix(f".{training_pipeline.DATA_ARTIFACT_FORMAT}"))
 
 
 class DataIngestionConfig:
@@ -25,26 +30,63 @@ class DataIngestionConfig:
             Path(training_pipeline_config.artifact_dir)
             / training_pipeline.DATA_INGESTION_DIR_NAME
         )
-        self.feature_store_file_path: Path = (
-            self.data_ingestion_dir
-            / training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR
-            / training_pipeline.FILE_NAME
+        ## the feature store lives outside the timestamped artifact dir so that
+        ## partitions accumulate across runs
+        self.feature_store_dir: Path = (
+            Path(training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR)
+            / Path(training_pipeline.FILE_NAME).stem
+        )
+        self.feature_store_manifest_file_path: Path = (
+            self.feature_store_dir / training_pipeline.DATA_INGESTION_FEATURE_STORE_MANIFEST_FILE_NAME
         )
+        self.watermark_key: str = training_pipeline.DATA_INGESTION_WATERMARK_KEY
+        self.incremental: bool = training_pipeline.DATA_INGESTION_INCREMENTAL
         self.training_file_path: Path = (
             self.data_ingestion_dir
             / training_pipeline.DATA_INGESTION_INGESTED_DIR
-            / training_pipeline.TRAIN_FILE_NAME
+            / _artifact_file_name(training_pipeline.TRAIN_FILE_NAME)
         )
         self.testing_file_path: Path = (
             self.data_ingestion_dir
             / training_pipeline.DATA_INGESTION_INGESTED_DIR
-            / training_pipeline.TEST_FILE_NAME
+            / _artifact_file_name(training_pipeline.TEST_FILE_NAME)
         )
         self.train_test_split_ratio: float = (
             training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATION
         )
+        self.split_hash_key: str = training_pipeline.DATA_INGESTION_SPLIT_HASH_KEY
+        self.split_key_columns: list[str] | None = training_pipeline.DATA_INGESTION_SPLIT_KEY_COLUMNS
+        self.split_stratify_column: str | None = (
+            training_pipeline.TARGET_COLUMN if training_pipeline.DATA_INGESTION_SPLIT_STRATIFY else None
+        )
         self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
         self.database_name: str = training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.cursor_batch_size: int = training_pipeline.DATA_INGESTION_CURSOR_BATCH_SIZE
+        self.read_parallelism: int = training_pipeline.DATA_INGESTION_READ_PARALLELISM
+        self.partition_key: str = training_pipeline.DATA_INGESTION_PARTITION_KEY
+        self.partition_rows: int = training_pipeline.DATA_INGESTION_PARTITION_ROWS
+        self.schema_file_path: Path = training_pipeline.SCHEMA_FILE_PATH
+        self.artifact_format: str = training_pipeline.DATA_ARTIFACT_FORMAT
+
+
+class BulkLoadConfig:
+    def __init__(
+        self,
+        input_file_path: Path | None = None,
+        batch_size: int | None = None,
+        num_writers: int | None = None,
+    ) -> None:
+        self.input_file_path: Path = Path(input_file_path or training_pipeline.BULK_LOAD_FILE_PATH)
+        self.database_name: str = training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
+        self.batch_size: int = batch_size or training_pipeline.BULK_LOAD_BATCH_SIZE
+        self.num_writers: int = num_writers or training_pipeline.BULK_LOAD_WRITERS
+        ## one checkpoint per input and target, so rerunning the same load resumes it
+        self.manifest_file_path: Path = (
+            training_pipeline.BULK_LOAD_DIR
+            / f"{self.database_name}.{self.collection_name}"
+            / f"{self.input_file_path.stem}.yaml"
+        )
 
 
 class DataValidationConfig:
@@ -60,22 +102,23 @@ class DataValidationConfig:
             self.data_validation_dir / training_pipeline.DATA_VALIDATION_INVALID_DIR
         )
         self.valid_train_file_path: Path = (
-            self.valid_data_dir / training_pipeline.TRAIN_FILE_NAME
+            self.valid_data_dir / _artifact_file_name(training_pipeline.TRAIN_FILE_NAME)
         )
         self.valid_test_file_path: Path = (
-            self.valid_data_dir / training_pipeline.TEST_FILE_NAME
+            self.valid_data_dir / _artifact_file_name(training_pipeline.TEST_FILE_NAME)
         )
         self.invalid_train_file_path: Path = (
-            self.invalid_data_dir / training_pipeline.TRAIN_FILE_NAME
+            self.invalid_data_dir / _artifact_file_name(training_pipeline.TRAIN_FILE_NAME)
         )
         self.invalid_test_file_path: Path = (
-            self.invalid_data_dir / training_pipeline.TEST_FILE_NAME
+            self.invalid_data_dir / _artifact_file_name(training_pipeline.TEST_FILE_NAME)
         )
         self.drift_report_file_path: Path = (
             self.data_validation_dir
             / training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR
             / training_pipeline.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME
         )
+        self.artifact_format: str = training_pipeline.DATA_ARTIFACT_FORMAT
 
 
 class DataTransformationConfig:
@@ -99,6 +142,7 @@ class DataTransformationConfig:
             / training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR
             / training_pipeline.PREPROCESSING_OBJECT_FILE_NAME
         )
+        self.artifact_format: str = training_pipeline.DATA_ARTIFACT_FORMAT
 
 
 class ModelTrainerConfig:
@@ -116,3 +160,47 @@ class ModelTrainerConfig:
         self.overfitting_underfitting_threshold = (
             training_pipeline.MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD
         )
+
+
+class BatchPredictionConfig:
+    def __init__(
+        self,
+        input_file_path: Path | None = None,
+        output_dir: Path | None = None,
+        num_workers: int | None = None,
+    ) -> None:
+        ## without an input file the Mongo collection used for training is scored
+        self.input_file_path: Path | None = (
+            Path(input_file_path) if input_file_path is not None else None
+        )
+        self.database_name: str = training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
+        ## derived from the input, so rerunning the same input resumes by default
+        source_name = (
+            self.input_file_path.stem
+            if self.input_file_path is not None
+            else f"{self.database_name}.{self.collection_name}"
+        )
+        self.output_dir: Path = (
+            Path(output_dir)
+            if output_dir is not None
+            else prediction_pipeline.BATCH_PREDICTION_DIR / source_name
+        )
+        self.manifest_file_path: Path = (
+            self.output_dir / prediction_pipeline.BATCH_PREDICTION_MANIFEST_FILE_NAME
+        )
+        self.num_workers: int = num_workers or os.cpu_count() or 1
+        self.shard_bytes: int = prediction_pipeline.BATCH_PREDICTION_SHARD_BYTES
+        self.shard_rows: int = prediction_pipeline.BATCH_PREDICTION_SHARD_ROWS
+        self.cursor_batch_size: int = prediction_pipeline.BATCH_PREDICTION_CURSOR_BATCH_SIZE
+        self.output_format: str = prediction_pipeline.BATCH_PREDICTION_OUTPUT_FORMAT
+        self.preprocessor_file_path: Path = (
+            prediction_pipeline.FINAL_MODEL_DIR
+            / prediction_pipeline.FINAL_PREPROCESSOR_FILE_NAME
+        )
+        self.model_file_path: Path = (
+            prediction_pipeline.FINAL_MODEL_DIR / prediction_pipeline.FINAL_MODEL_FILE_NAME
+        )
+        self.use_compiled_model: bool = (
+            prediction_pipeline.MODEL_SERVING_USE_COMPILED_MODEL
+        )
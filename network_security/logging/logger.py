@@ -5,12 +5,20 @@ from pathlib import Path
 LOG_FILE = f"{datetime.now(UTC).strftime('%m_%d_%Y_%H_%M_%S')}.log"
 
 logs_path = Path.cwd() / "logs"
-logs_path.mkdir(parents=True, exist_ok=True)
 
 LOG_FILE_PATH = logs_path / LOG_FILE
 
+
+class _LazyFileHandler(logging.FileHandler):
+    """FileHandler that creates the logs directory and file on the first record, not on import."""
+
+    def _open(self) -> object:
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
 logging.basicConfig(
-    filename=LOG_FILE_PATH,
+    handlers=[_LazyFileHandler(LOG_FILE_PATH, delay=True)],
     format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
     level=logging.INFO,
 )
@@ -0,0 +1,361 @@
+import argparse
+import io
+import itertools
+import multiprocessing
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+
+from network_security.constant.prediction_pipeline import (
+    FINAL_MODEL_CURRENT_FILE_NAME,
+    FINAL_MODEL_VERSIONS_DIR,
+    PREDICTION_COLUMN_NAME,
+)
+from network_security.constant.training_pipeline import SCHEMA_FILE_PATH
+from network_security.entity.artifact_entity import BatchPredictionArtifact
+from network_security.entity.config_entity import BatchPredictionConfig
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+from network_security.serving.model_holder import ModelHolder
+from network_security.utils.main_utils.columnar import ColumnarBuffer
+from network_security.utils.main_utils.schema_types import SchemaTypes
+from network_security.utils.main_utils.utils import (
+    read_schema_columns,
+    read_version_marker,
+    read_yaml_file,
+    write_yaml_file,
+)
+
+## model and schema of a batch worker process, created by _init_batch_worker
+_worker_model_holder: ModelHolder | None = None
+_worker_schema_types: SchemaTypes | None = None
+
+
+def _init_batch_worker(
+    preprocessor_file_path: Path,
+    model_file_path: Path,
+    use_compiled_model: bool,
+) -> None:
+    """Load the model once per worker; there is no watcher, the files are those of the run's version."""
+    global _worker_model_holder, _worker_schema_types
+    _worker_schema_types = SchemaTypes(SCHEMA_FILE_PATH)
+    _worker_model_holder = ModelHolder(
+        preprocessor_file_path=preprocessor_file_path,
+        model_file_path=model_file_path,
+        poll_interval=0,
+        use_compiled_model=use_compiled_model,
+    )
+    _worker_model_holder.load()
+
+
+def _read_csv_shard(shard: dict) -> pd.DataFrame:
+    with Path(shard["path"]).open("rb") as file_obj:
+        file_obj.seek(shard["start"])
+        data = file_obj.read(shard["end"] - shard["start"])
+    return pd.read_csv(io.BytesIO(data), header=None, names=shard["columns"], na_values=["na"])
+
+
+def _read_parquet_shard(shard: dict) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(shard["path"]).read_row_group(shard["row_group"]).to_pandas()
+
+
+def _read_mongo_shard(shard: dict, collection: object = None) -> pd.DataFrame:
+    """
+    Read one _id range into compact columns, one cursor batch at a time.
+
+    Documents go straight into int8 column arrays ("na" and null become NaN,
+    see ColumnarBuffer), so no list of the shard's documents is built.
+    """
+    from bson import ObjectId
+
+    from network_security.cloud.mongo_client import get_mongo_collection
+
+    id_range = {"$gte": ObjectId(shard["start"])}
+    if shard["end"] is not None:
+        id_range["$lt"] = ObjectId(shard["end"])
+    if collection is None:
+        ## the worker's own process-wide client, shared by all its shards
+        collection = get_mongo_collection(shard["database"], shard["collection"])
+    buffer = ColumnarBuffer(shard["columns"], capacity=shard["rows"])
+    cursor = collection.find({"_id": id_range}, {"_id": 0}, batch_size=shard["batch_size"])
+    for batch in itertools.batched(cursor, shard["batch_size"]):
+        buffer.write(buffer.allocate(len(batch)), batch)
+    return buffer.to_dataframe(buffer.allocated_rows)
+
+
+_SHARD_READERS = {
+    "csv": _read_csv_shard,
+    "parquet": _read_parquet_shard,
+    "mongo": _read_mongo_shard,
+}
+
+
+def _score_shard(shard: dict, output_file_path: Path, output_format: str) -> int:
+    """Read, type, score and write one shard inside a worker; returns the row count."""
+    try:
+        ## typed like the training data; a value outside the schema fails the shard
+        dataframe = _worker_schema_types.enforce(_SHARD_READERS[shard["kind"]](shard))
+        dataframe[PREDICTION_COLUMN_NAME] = _worker_model_holder.get().predict(dataframe)
+    except Exception as e:
+        ## NetworkSecurityException keeps a reference to the sys module and
+        ## cannot be pickled back to the parent process
+        raise RuntimeError(str(e)) from None
+
+    tmp_file_path = output_file_path.with_name(f".{output_file_path.name}.tmp")
+    if output_format == "parquet":
+        dataframe.to_parquet(tmp_file_path, index=False)
+    else:
+        dataframe.to_csv(tmp_file_path, index=False)
+    tmp_file_path.replace(output_file_path)
+    return len(dataframe)
+
+
+class BatchPrediction:
+    """
+    Offline scorer for large CSV, Parquet or Mongo inputs.
+
+    The input is split into a deterministic shard plan (newline aligned byte
+    ranges for CSV, row groups for Parquet, _id ranges for Mongo). Each shard
+    is read, scored and written as its own part file by a spawned worker
+    process that loaded the NetworkModel once, so reading and parsing scale with
+    the workers too. Finished shards are recorded in a manifest; rerunning the
+    same input, plan and model version skips them.
+
+    The current model marker is read once per run: every worker loads the
+    files of that published version, so a model pushed during the run is not
+    mixed into its output.
+    """
+
+    def __init__(self, batch_prediction_config: BatchPredictionConfig, collection: object = None) -> None:
+        try:
+            self.batch_prediction_config = batch_prediction_config
+            ## an injected collection (e.g. a mongomock one) replaces the Atlas collection
+            ## when planning; workers always connect on their own
+            self.collection = collection
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def get_collection(self) -> object:
+        if self.collection is None:
+            from network_security.cloud.mongo_client import get_mongo_collection
+
+            self.collection = get_mongo_collection(
+                self.batch_prediction_config.database_name,
+                self.batch_prediction_config.collection_name,
+            )
+        return self.collection
+
+    def resolve_model_dir(self) -> Path:
+        """Directory of the model version published now; final_model/ itself before versioning."""
+        model_dir = self.batch_prediction_config.model_file_path.parent
+        published_version = read_version_marker(model_dir / FINAL_MODEL_CURRENT_FILE_NAME)
+        if published_version is None:
+            return model_dir
+        return model_dir / FINAL_MODEL_VERSIONS_DIR / published_version
+
+    def plan_csv_shards(self, file_path: Path) -> list[dict]:
+        file_size = file_path.stat().st_size
+        with file_path.open("rb") as file_obj:
+            columns = pd.read_csv(io.BytesIO(file_obj.readline()), nrows=0).columns.tolist()
+            start = file_obj.tell()
+            shards = []
+            while start < file_size:
+                file_obj.seek(min(start + self.batch_prediction_config.shard_bytes, file_size))
+                file_obj.readline()
+                end = min(file_obj.tell(), file_size)
+                shards.append(
+                    {"kind": "csv", "path": str(file_path), "start": start, "end": end, "columns": columns},
+                )
+                start = end
+        return shards
+
+    def plan_parquet_shards(self, file_path: Path) -> list[dict]:
+        import pyarrow.parquet as pq
+
+        num_row_groups = pq.ParquetFile(file_path).metadata.num_row_groups
+        return [
+            {"kind": "parquet", "path": str(file_path), "row_group": row_group}
+            for row_group in range(num_row_groups)
+        ]
+
+    def plan_mongo_shards(self) -> list[dict]:
+        import pymongo
+
+        config = self.batch_prediction_config
+        ## an index-only pass over _id that keeps every shard_rows-th id
+        cursor = self.get_collection().find({}, {"_id": 1}).sort("_id", pymongo.ASCENDING)
+        boundaries = [
+            str(document["_id"])
+            for position, document in enumerate(cursor)
+            if position % config.shard_rows == 0
+        ]
+        columns = read_schema_columns(SCHEMA_FILE_PATH)
+        return [
+            {
+                "kind": "mongo",
+                "database": config.database_name,
+                "collection": config.collection_name,
+                "start": start,
+                "end": boundaries[index + 1] if index + 1 < len(boundaries) else None,
+                "columns": columns,
+                "rows": config.shard_rows,
+                "batch_size": config.cursor_batch_size,
+            }
+            for index, start in enumerate(boundaries)
+        ]
+
+    def plan_shards(self) -> list[dict]:
+        try:
+            input_file_path = self.batch_prediction_config.input_file_path
+            if input_file_path is None:
+                return self.plan_mongo_shards()
+            if input_file_path.suffix == ".parquet":
+                return self.plan_parquet_shards(input_file_path)
+            return self.plan_csv_shards(input_file_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def input_stat(self) -> dict:
+        """
+        Fingerprint of the input's content, part of the resume key.
+
+        The shard plan alone does not change when a file is rewritten in place
+        with the same layout, or when documents are added after the last _id
+        boundary.
+        """
+        input_file_path = self.batch_prediction_config.input_file_path
+        if input_file_path is None:
+            return {"documents": self.get_collection().estimated_document_count()}
+        stat = input_file_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def load_manifest(self, shards: list[dict], model_dir: Path, model_version: str, input_stat: dict) -> dict:
+        """Return the previous run's manifest if it can be resumed, else a fresh one."""
+        manifest_file_path = self.batch_prediction_config.manifest_file_path
+        resume_key = {
+            "model_dir": str(model_dir),
+            "model_version": model_version,
+            "input_stat": input_stat,
+            "shards": shards,
+        }
+        if manifest_file_path.exists():
+            manifest = read_yaml_file(manifest_file_path)
+            if all(manifest.get(key) == value for key, value in resume_key.items()):
+                logging.info(
+                    f"Resuming batch prediction with {len(manifest['completed'])} of {len(shards)} shards done",
+                )
+                return manifest
+            logging.info("Input, shard plan or model changed since the last run; starting over")
+        return {**resume_key, "completed": {}}
+
+    def write_manifest(self, manifest: dict) -> None:
+        manifest_file_path = self.batch_prediction_config.manifest_file_path
+        tmp_file_path = manifest_file_path.with_name(f".{manifest_file_path.name}.tmp")
+        write_yaml_file(tmp_file_path, manifest)
+        tmp_file_path.replace(manifest_file_path)
+
+    def initiate_batch_prediction(self) -> BatchPredictionArtifact:
+        try:
+            config = self.batch_prediction_config
+            config.output_dir.mkdir(parents=True, exist_ok=True)
+
+            ## the marker is read once; workers load this version's files even if
+            ## another model is published meanwhile
+            model_dir = self.resolve_model_dir()
+            preprocessor_file_path = model_dir / config.preprocessor_file_path.name
+            model_file_path = model_dir / config.model_file_path.name
+            ## checkpoints written with another model are not resumed
+            model_version = ModelHolder(
+                preprocessor_file_path=preprocessor_file_path,
+                model_file_path=model_file_path,
+                poll_interval=0,
+                use_compiled_model=config.use_compiled_model,
+            ).peek_version()
+            input_stat = self.input_stat()
+            shards = self.plan_shards()
+            manifest = self.load_manifest(shards, model_dir, model_version, input_stat)
+            pending = [
+                shard_id for shard_id in range(len(shards)) if shard_id not in manifest["completed"]
+            ]
+            logging.info(
+                f"Scoring {len(pending)} of {len(shards)} shards with the model in {model_dir} "
+                f"on {config.num_workers} workers",
+            )
+
+            started = time.perf_counter()
+            scored_rows = 0
+            with ProcessPoolExecutor(
+                max_workers=config.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_batch_worker,
+                initargs=(preprocessor_file_path, model_file_path, config.use_compiled_model),
+            ) as pool:
+                futures = {
+                    pool.submit(
+                        _score_shard,
+                        shards[shard_id],
+                        config.output_dir / f"part-{shard_id:05d}.{config.output_format}",
+                        config.output_format,
+                    ): shard_id
+                    for shard_id in pending
+                }
+                failure = None
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        shard_id = futures.pop(future)
+                        if future.cancelled():
+                            continue
+                        if future.exception() is not None:
+                            if failure is None:
+                                ## stop at the first failed shard: queued shards are
+                                ## cancelled, running ones finish and are checkpointed
+                                failure = future.exception()
+                                for pending_future in futures:
+                                    pending_future.cancel()
+                            continue
+                        rows = future.result()
+                        scored_rows += rows
+                        manifest["completed"][shard_id] = rows
+                    self.write_manifest(manifest)
+                if failure is not None:
+                    raise failure
+            elapsed = time.perf_counter() - started
+            if scored_rows:
+                logging.info(
+                    f"Scored {scored_rows} rows in {elapsed:.1f}s ({scored_rows / elapsed:,.0f} rows/sec)",
+                )
+
+            batch_prediction_artifact = BatchPredictionArtifact(
+                output_dir=str(config.output_dir),
+                manifest_file_path=str(config.manifest_file_path),
+                shard_count=len(shards),
+                scored_shard_count=len(pending),
+                total_rows=sum(manifest["completed"].values()),
+            )
+            logging.info(f"Batch prediction artifact: {batch_prediction_artifact}")
+            return batch_prediction_artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a large dataset with the final model")
+    parser.add_argument("--input", type=Path, default=None, help="CSV or Parquet file; Mongo when omitted")
+    parser.add_argument("--output-dir", type=Path, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    batch_prediction = BatchPrediction(
+        BatchPredictionConfig(
+            input_file_path=args.input,
+            output_dir=args.output_dir,
+            num_workers=args.workers,
+        ),
+    )
+    print(batch_prediction.initiate_batch_prediction())
@@ -0,0 +1,195 @@
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+from pymongo.errors import BulkWriteError
+
+from network_security.cloud.bulk_load_registry import (
+    BULK_LOAD_COMPLETE,
+    BULK_LOAD_RUNNING,
+    BULK_LOAD_SUPERSEDED,
+    document_id,
+    set_bulk_load_status,
+)
+from network_security.cloud.mongo_client import get_mongo_collection
+from network_security.entity.artifact_entity import BulkLoadArtifact
+from network_security.entity.config_entity import BulkLoadConfig
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+from network_security.utils.main_utils.utils import read_yaml_file, write_yaml_file
+
+## mongodb error code of a duplicate _id, i.e. a row an earlier attempt already inserted
+_DUPLICATE_KEY_ERROR = 11000
+## seconds between progress lines
+_PROGRESS_INTERVAL = 5.0
+
+
+class BulkLoad:
+    """
+    Streaming loader of a raw CSV into the ingestion collection.
+
+    The CSV is read in chunks of batch_size rows, each turned into documents
+    straight from its columns and inserted with one unordered insert_many
+    on a small pool of writer threads sharing the process-wide MongoClient. At most two
+    chunks per writer are in memory. Finished batches are recorded in a
+    manifest; rerunning the same load after a failure skips them. The load is
+    registered as running in the bulk load registry until every batch is in.
+    """
+
+    def __init__(self, bulk_load_config: BulkLoadConfig, collection: object = None) -> None:
+        try:
+            self.bulk_load_config = bulk_load_config
+            ## an injected collection (e.g. a mongomock one) replaces the Atlas collection
+            self.collection = collection
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def get_collection(self) -> object:
+        if self.collection is None:
+            self.collection = get_mongo_collection(
+                self.bulk_load_config.database_name,
+                self.bulk_load_config.collection_name,
+            )
+        return self.collection
+
+    def load_manifest(self, collection: object) -> dict:
+        """
+        Return the previous load's manifest if it can be resumed, else a fresh one.
+
+        A fresh manifest is written before it is returned, i.e. before the first
+        batch: a crash at any later point resumes with the same load_id, so
+        retried rows get the same _id and are not inserted twice.
+        """
+        config = self.bulk_load_config
+        stat = config.input_file_path.stat()
+        source = {
+            "path": str(config.input_file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "batch_size": config.batch_size,
+        }
+        if config.manifest_file_path.exists():
+            manifest = read_yaml_file(config.manifest_file_path)
+            if manifest["source"] == source:
+                logging.info(f"Resuming bulk load with {len(manifest['completed'])} batches done")
+                return manifest
+            logging.info("Input file or batch size changed since the last load; starting over")
+            ## its rows stay in the collection; ingestion no longer waits for them
+            set_bulk_load_status(collection, manifest["load_id"], BULK_LOAD_SUPERSEDED)
+        manifest = {"source": source, "load_id": int(time.time()), "completed": {}}
+        self.write_manifest(manifest)
+        return manifest
+
+    def write_manifest(self, manifest: dict) -> None:
+        manifest_file_path = self.bulk_load_config.manifest_file_path
+        manifest_file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file_path = manifest_file_path.with_name(f".{manifest_file_path.name}.tmp")
+        write_yaml_file(tmp_file_path, manifest)
+        tmp_file_path.replace(manifest_file_path)
+
+    def iter_batches(self, load_id: int) -> Iterator[tuple[int, list[dict]]]:
+        """Yield (batch number, documents) for every batch_size rows of the CSV."""
+        batch_size = self.bulk_load_config.batch_size
+        chunks = pd.read_csv(self.bulk_load_config.input_file_path, chunksize=batch_size)
+        for batch, chunk in enumerate(chunks):
+            if chunk.isna().to_numpy().any():
+                ## missing cells are stored as null, as the JSON round trip did
+                chunk = chunk.astype(object).where(chunk.notna(), None)
+            ## to_dict boxes numpy scalars into python ones, which bson can encode
+            documents = chunk.to_dict("records")
+            first_row = batch * batch_size
+            for row, document in enumerate(documents, start=first_row):
+                document["_id"] = document_id(load_id, row)
+            yield batch, documents
+
+    @staticmethod
+    def insert_batch(collection: object, documents: list[dict]) -> int:
+        """Insert documents unordered; rows that are already present count as loaded."""
+        try:
+            collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != _DUPLICATE_KEY_ERROR for error in errors):
+                raise
+        return len(documents)
+
+    def initiate_bulk_load(self) -> BulkLoadArtifact:
+        try:
+            config = self.bulk_load_config
+            collection = self.get_collection()
+            manifest = self.load_manifest(collection)
+            completed = manifest["completed"]
+            logging.info(
+                f"Loading {config.input_file_path} into {config.database_name}.{config.collection_name} "
+                f"in batches of {config.batch_size} on {config.num_writers} writers",
+            )
+            ## registered before any row is inserted: until the load is complete,
+            ## incremental ingestion keeps its _id watermark below this load's ids
+            set_bulk_load_status(
+                collection, manifest["load_id"], BULK_LOAD_RUNNING, source=str(config.input_file_path),
+            )
+
+            started = time.perf_counter()
+            batch_count, loaded_batches, loaded_rows = 0, 0, 0
+            with ThreadPoolExecutor(
+                max_workers=config.num_writers, thread_name_prefix="bulk-load",
+            ) as pool:
+                futures = {}
+                last_progress = started
+
+                def collect() -> None:
+                    """Record the batches that finished; re-raise the first failure after checkpointing."""
+                    nonlocal loaded_batches, loaded_rows, last_progress
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    failure = None
+                    for future in done:
+                        batch = futures.pop(future)
+                        if future.exception() is not None:
+                            failure = failure or future.exception()
+                            continue
+                        completed[batch] = future.result()
+                        loaded_batches += 1
+                        loaded_rows += completed[batch]
+                    self.write_manifest(manifest)
+                    if failure is not None:
+                        raise failure
+                    now = time.perf_counter()
+                    if now - last_progress >= _PROGRESS_INTERVAL:
+                        last_progress = now
+                        print(
+                            f"{loaded_rows} rows in {loaded_batches} batches "
+                            f"({loaded_rows / (now - started):,.0f} rows/sec)",
+                        )
+
+                for batch, documents in self.iter_batches(manifest["load_id"]):
+                    batch_count = batch + 1
+                    if batch in completed:
+                        continue
+                    futures[pool.submit(self.insert_batch, collection, documents)] = batch
+                    ## bounded read-ahead keeps memory at a few batches
+                    if len(futures) >= 2 * config.num_writers:
+                        collect()
+                while futures:
+                    collect()
+
+            set_bulk_load_status(collection, manifest["load_id"], BULK_LOAD_COMPLETE)
+            elapsed = time.perf_counter() - started
+            summary = (
+                f"Loaded {loaded_rows} rows in {loaded_batches} of {batch_count} batches "
+                f"in {elapsed:.1f}s ({loaded_rows / max(elapsed, 1e-9):,.0f} rows/sec)"
+            )
+            logging.info(summary)
+            print(summary)
+
+            bulk_load_artifact = BulkLoadArtifact(
+                manifest_file_path=str(config.manifest_file_path),
+                batch_count=batch_count,
+                loaded_batch_count=loaded_batches,
+                total_rows=sum(completed.values()),
+            )
+            logging.info(f"Bulk load artifact: {bulk_load_artifact}")
+            return bulk_load_artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -1,4 +1,5 @@
 import sys
+from collections.abc import Callable
 
 from network_security.cloud.s3_syncer import S3Sync
 from network_security.components.data_ingestion import DataIngestion
@@ -21,12 +22,25 @@ from network_security.entity.config_entity import (
 )
 from network_security.exception.exception import NetworkSecurityException
 from network_security.logging.logger import logging
+from network_security.utils.main_utils.write_behind import WriteBehind
 
 
 class TrainingPipeline:
-    def __init__(self) -> None:
+    def __init__(self, stage_listener: Callable[[str, str], None] | None = None) -> None:
         self.training_pipeline_config = TrainingPipelineConfig()
         self.s3_sync = S3Sync()
+        ## called with (stage_name, event) where event is "started" or "completed"
+        self.stage_listener = stage_listener
+        ## set by run_pipeline in in-memory handoff mode
+        self.write_behind: WriteBehind | None = None
+
+    def _run_stage(self, stage_name: str, stage: Callable, **kwargs: object) -> object:
+        if self.stage_listener is not None:
+            self.stage_listener(stage_name, "started")
+        result = stage(**kwargs)
+        if self.stage_listener is not None:
+            self.stage_listener(stage_name, "completed")
+        return result
 
     def start_data_ingestion(self) -> DataIngestionArtifact:
         try:
@@ -36,6 +50,7 @@ class TrainingPipeline:
             logging.info("Initiated Data Ingestion")
             data_ingestion = DataIngestion(
                 data_ingestion_config=self.data_ingestion_config,
+                write_behind=self.write_behind,
             )
             data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
             logging.info(
@@ -57,6 +72,7 @@ class TrainingPipeline:
             data_validation = DataValidation(
                 data_ingestion_artifact=data_ingestion_artifact,
                 data_validation_config=self.data_validation_config,
+                write_behind=self.write_behind,
             )
             data_validation_artifact = data_validation.initiate_data_validation()
             logging.info(
@@ -77,6 +93,7 @@ class TrainingPipeline:
             data_transformation = DataTransformation(
                 data_validation_artifact=data_validation_artifact,
                 data_transformation_config=self.data_transformation_config,
+                write_behind=self.write_behind,
             )
 
             data_transformation_artifact = (
@@ -134,20 +151,44 @@ class TrainingPipeline:
             raise NetworkSecurityException(e, sys)
 
     def run_pipeline(self) -> ModelTrainerArtifact:
+        """
+        Run every stage and sync the results to s3.
+
+        In in-memory handoff mode each stage passes its DataFrames/arrays to
+        the next one directly and its artifact files are written in the
+        background while the next stage computes; all writes have finished
+        before the artifact dir is synced.
+        """
+        if self.training_pipeline_config.in_memory_handoff:
+            self.write_behind = WriteBehind(self.training_pipeline_config.write_behind_workers)
         try:
-            data_ingestion_artifact = self.start_data_ingestion()
-            data_validation_artifact = self.start_data_validation(
+            data_ingestion_artifact = self._run_stage(
+                "data_ingestion", self.start_data_ingestion,
+            )
+            data_validation_artifact = self._run_stage(
+                "data_validation",
+                self.start_data_validation,
                 data_ingestion_artifact=data_ingestion_artifact,
             )
-            data_transformation_artifact = self.start_data_transformation(
+            data_transformation_artifact = self._run_stage(
+                "data_transformation",
+                self.start_data_transformation,
                 data_validation_artifact=data_validation_artifact,
             )
-            model_trainer_artifact = self.start_model_trainer(
+            model_trainer_artifact = self._run_stage(
+                "model_trainer",
+                self.start_model_trainer,
                 data_transformation_artifact=data_transformation_artifact,
             )
-            self.sync_artifact_dir_to_s3()
-            self.sync_saved_model_dir_to_s3()
+            if self.write_behind is not None:
+                self.write_behind.wait()
+            self._run_stage("sync_artifact_dir_to_s3", self.sync_artifact_dir_to_s3)
+            self._run_stage("sync_saved_model_dir_to_s3", self.sync_saved_model_dir_to_s3)
 
             return model_trainer_artifact
         except Exception as e:
             raise NetworkSecurityException(e, sys)
+        finally:
+            if self.write_behind is not None:
+                self.write_behind.close()
+                self.write_behind = None
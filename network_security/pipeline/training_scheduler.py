@@ -0,0 +1,214 @@
+import multiprocessing
+import multiprocessing.queues
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+
+## event queue of a training worker process, set by _init_training_worker
+_event_queue: multiprocessing.queues.Queue | None = None
+
+
+def _init_training_worker(event_queue: multiprocessing.queues.Queue, niceness: int) -> None:
+    global _event_queue
+    _event_queue = event_queue
+    os.nice(niceness)
+
+
+def _run_training_job(job_id: str) -> None:
+    from network_security.pipeline.training_pipeline import TrainingPipeline
+
+    def on_stage(stage_name: str, event: str) -> None:
+        _event_queue.put((job_id, stage_name, event, time.time()))
+
+    _event_queue.put((job_id, None, "started", time.time()))
+    try:
+        TrainingPipeline(stage_listener=on_stage).run_pipeline()
+    except Exception as e:
+        ## NetworkSecurityException keeps a reference to the sys module and
+        ## cannot be pickled back to the parent process
+        raise RuntimeError(str(e)) from None
+
+
+@dataclass
+class TrainingStage:
+    name: str
+    status: str = "running"
+    started_at: float | None = None
+    finished_at: float | None = None
+    duration_seconds: float | None = None
+
+
+@dataclass
+class TrainingJob:
+    job_id: str
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    duration_seconds: float | None = None
+    current_stage: str | None = None
+    stages: list[TrainingStage] = field(default_factory=list)
+    error: str | None = None
+
+
+class TrainingJobScheduler:
+    """
+    Runs TrainingPipeline jobs in the background.
+
+    Jobs execute in spawned, lower priority worker processes so a GridSearch run
+    never holds the API's GIL or event loop. The pool size is the concurrency
+    limit (one run by default, so runs never race on final_model/), and further
+    submissions wait in the pool's queue. Workers report stage progress over a
+    queue that a listener thread folds into the job records. A worker that
+    dies (e.g. killed for memory) breaks the pool; its jobs are marked failed
+    and the pool is replaced, so later submissions still run.
+    """
+
+    def __init__(self, max_concurrent: int, niceness: int, history_size: int) -> None:
+        try:
+            self.max_concurrent = max_concurrent
+            self.niceness = niceness
+            self.history_size = history_size
+            self._jobs: OrderedDict[str, TrainingJob] = OrderedDict()
+            self._lock = threading.Lock()
+            self._pool: ProcessPoolExecutor | None = None
+            ## guards creating and replacing the pool
+            self._pool_lock = threading.Lock()
+            self._event_queue: multiprocessing.queues.Queue | None = None
+            self._listener: threading.Thread | None = None
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_concurrent,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_training_worker,
+            initargs=(self._event_queue, self.niceness),
+        )
+
+    def start(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                return
+            self._event_queue = multiprocessing.get_context("spawn").Queue()
+            self._pool = self._new_pool()
+            self._listener = threading.Thread(
+                target=self._listen, name="training-job-listener", daemon=True,
+            )
+            self._listener.start()
+
+    def _replace_broken_pool(self, broken_pool: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Swap a pool broken by a crashed worker for a fresh one (once, however many jobs notice)."""
+        with self._pool_lock:
+            if self._pool is broken_pool:
+                logging.info("A training worker process died; replacing the training pool")
+                broken_pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is None:
+                return
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._event_queue.put(None)
+            self._listener.join(timeout=1)
+            self._pool = None
+
+    def submit(self) -> str:
+        """Queue a training run and return its job id immediately."""
+        job = TrainingJob(job_id=uuid.uuid4().hex)
+        try:
+            self.start()
+            with self._lock:
+                self._jobs[job.job_id] = job
+                self._evict_finished_jobs()
+            pool = self._pool
+            try:
+                future = pool.submit(_run_training_job, job.job_id)
+            except BrokenProcessPool:
+                pool = self._replace_broken_pool(pool)
+                future = pool.submit(_run_training_job, job.job_id)
+            future.add_done_callback(lambda f: self._on_done(job.job_id, f, pool))
+            logging.info(f"Queued training job {job.job_id}")
+            return job.job_id
+        except Exception as e:
+            with self._lock:
+                job.status = "failed"
+                job.error = str(e)
+            raise NetworkSecurityException(e, sys)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return asdict(job) if job is not None else None
+
+    def _evict_finished_jobs(self) -> None:
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.status in ("succeeded", "failed")
+        ]
+        for job_id in finished[: max(0, len(self._jobs) - self.history_size)]:
+            del self._jobs[job_id]
+
+    def _listen(self) -> None:
+        while True:
+            event = self._event_queue.get()
+            if event is None:
+                return
+            job_id, stage_name, status, timestamp = event
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                if stage_name is None:
+                    ## the completion callback may have raced ahead of this event
+                    job.started_at = timestamp
+                    if job.status == "queued":
+                        job.status = "running"
+                    if job.finished_at is not None:
+                        job.duration_seconds = job.finished_at - timestamp
+                elif status == "started":
+                    if job.finished_at is None:
+                        job.current_stage = stage_name
+                    job.stages.append(TrainingStage(name=stage_name, started_at=timestamp))
+                else:
+                    stage = job.stages[-1]
+                    stage.status = "completed"
+                    stage.finished_at = timestamp
+                    stage.duration_seconds = timestamp - stage.started_at
+
+    def _on_done(self, job_id: str, future: Future, pool: ProcessPoolExecutor) -> None:
+        finished_at = time.time()
+        error = None if future.cancelled() else future.exception()
+        if isinstance(error, BrokenProcessPool):
+            ## every job of the broken pool fails; the next submission gets a new pool
+            self._replace_broken_pool(pool)
+            error = "the training worker process terminated abruptly"
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.finished_at = finished_at
+            if job.started_at is not None:
+                job.duration_seconds = finished_at - job.started_at
+            job.current_stage = None
+            if future.cancelled() or error is not None:
+                job.status = "failed"
+                job.error = "cancelled" if future.cancelled() else str(error)
+                if job.stages and job.stages[-1].status == "running":
+                    job.stages[-1].status = "failed"
+            else:
+                job.status = "succeeded"
+        logging.info(f"Training job {job_id} finished with status {job.status}")
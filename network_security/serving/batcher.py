@@ -0,0 +1,156 @@
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+import pandas as pd
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+from network_security.utils.main_utils.schema_types import SchemaTypes
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-row prediction requests into batches.
+
+    Callers submit one feature record and await its prediction. A single collector
+    task drains the queue into a batch of at most max_batch_size rows, waiting no
+    longer than max_wait_seconds after the first row arrives, scores the whole
+    batch with one awaited vectorized predict call and fans the results back out.
+
+    At most max_concurrent_batches batches are scored at once; while they are
+    busy the queue keeps filling, so the next batch is simply larger. A batch
+    that fails is rescored one record at a time, so one bad record (e.g. a
+    value outside schema_types) only fails its own caller.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[pd.DataFrame], Awaitable[np.ndarray]],
+        feature_columns: list[str],
+        max_batch_size: int,
+        max_wait_seconds: float,
+        max_concurrent_batches: int,
+        schema_types: SchemaTypes | None = None,
+    ) -> None:
+        try:
+            self.predict_fn = predict_fn
+            self.feature_columns = feature_columns
+            self.max_batch_size = max_batch_size
+            self.max_wait_seconds = max_wait_seconds
+            self.max_concurrent_batches = max_concurrent_batches
+            self.schema_types = schema_types
+            self._queue: asyncio.Queue | None = None
+            self._collector: asyncio.Task | None = None
+            self._scoring: asyncio.Semaphore | None = None
+            self._score_tasks: set[asyncio.Task] = set()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    async def start(self) -> None:
+        if self._collector is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._scoring = asyncio.Semaphore(self.max_concurrent_batches)
+        self._collector = asyncio.create_task(self._collect())
+
+    async def stop(self) -> None:
+        """Stop collecting, cancel the batches being scored and fail every waiting caller."""
+        if self._collector is None:
+            return
+        self._collector.cancel()
+        for task in list(self._score_tasks):
+            task.cancel()
+        await asyncio.gather(self._collector, *self._score_tasks, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+        self._collector = None
+        self._score_tasks.clear()
+
+    async def submit(self, record: dict) -> object:
+        """
+        Queue one feature record and wait for its prediction.
+
+        The record must hold exactly the feature columns; None marks a missing
+        value. Unknown or absent keys raise ValueError before anything is queued.
+        """
+        unknown = sorted(record.keys() - set(self.feature_columns))
+        absent = [column for column in self.feature_columns if column not in record]
+        if unknown or absent:
+            raise ValueError(
+                f"Record must hold exactly the schema features (null for a missing value); "
+                f"unknown: {unknown}, absent: {absent}",
+            )
+        if self._collector is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        return await future
+
+    async def _next_batch(self) -> list[tuple[dict, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _collect(self) -> None:
+        ## batches are scored as separate tasks so the next batch can be gathered
+        ## while the executor is still busy with the previous one
+        while True:
+            await self._scoring.acquire()
+            try:
+                batch = await self._next_batch()
+            except BaseException:
+                self._scoring.release()
+                raise
+            ## callers that went away while queued do not need scoring
+            batch = [(record, future) for record, future in batch if not future.done()]
+            if not batch:
+                self._scoring.release()
+                continue
+            task = asyncio.create_task(self._run_batch(batch))
+            self._score_tasks.add(task)
+            task.add_done_callback(self._score_tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        try:
+            await self._score(batch)
+        finally:
+            self._scoring.release()
+
+    async def _score(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        try:
+            try:
+                frame = pd.DataFrame.from_records(
+                    [record for record, _ in batch], columns=self.feature_columns,
+                )
+                if self.schema_types is not None:
+                    frame = self.schema_types.enforce(frame)
+                y_hat = await self.predict_fn(frame)
+            except Exception as e:
+                if len(batch) == 1:
+                    raise
+                logging.info(f"Micro-batch of {len(batch)} rows failed, rescoring row by row: {e}")
+                await asyncio.gather(*(self._score([item]) for item in batch))
+                return
+            for (_, future), prediction in zip(batch, y_hat, strict=True):
+                if not future.done():
+                    future.set_result(prediction.item())
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
@@ -0,0 +1,114 @@
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi import UploadFile
+
+from network_security.constant.prediction_pipeline import (
+    PREDICTION_UPLOAD_MEDIA_TYPES,
+    PREDICTION_UPLOAD_SUFFIXES,
+)
+from network_security.exception.exception import NetworkSecurityException
+from network_security.utils.main_utils.schema_types import SchemaTypes
+
+_NPY_HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+
+def upload_format(upload: UploadFile) -> str:
+    """Pick the decoder from the content type, then the file suffix; CSV by default."""
+    content_type = (upload.content_type or "").split(";")[0].strip().lower()
+    if content_type in PREDICTION_UPLOAD_MEDIA_TYPES:
+        return PREDICTION_UPLOAD_MEDIA_TYPES[content_type]
+    suffix = Path(upload.filename or "").suffix.lower()
+    return PREDICTION_UPLOAD_SUFFIXES.get(suffix, "csv")
+
+
+def _decode_csv(source: io.IOBase, feature_columns: list[str]) -> pd.DataFrame:
+    return pd.read_csv(source, na_values=["na"])
+
+
+def _decode_parquet(source: io.IOBase, feature_columns: list[str]) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+
+    return pq.read_table(source).to_pandas()
+
+
+def _decode_arrow(source: io.IOBase, feature_columns: list[str]) -> pd.DataFrame:
+    """
+    Arrow IPC stream; columns are numpy views of the received buffer.
+
+    Single-chunk, null-free numeric columns are not copied; anything else
+    (nulls, several record batches, booleans) is materialized by pyarrow.
+    """
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(pa.py_buffer(source.read())).read_all()
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if column.num_chunks == 1:
+            columns[name] = column.chunk(0).to_numpy(zero_copy_only=False)
+        else:
+            columns[name] = column.to_numpy()
+    return pd.DataFrame(columns, copy=False)
+
+
+def _decode_npy(source: io.IOBase, feature_columns: list[str]) -> pd.DataFrame:
+    """
+    Raw .npy matrix whose columns follow the feature order of schema.yaml.
+
+    The array is a read-only view of the received bytes; wrapping it in a
+    single-block DataFrame does not copy it either.
+    """
+    data = source.read()
+    header = io.BytesIO(data)
+    version = np.lib.format.read_magic(header)
+    if version not in _NPY_HEADER_READERS:
+        raise ValueError(f"Unsupported .npy format version {version}")
+    shape, fortran_order, dtype = _NPY_HEADER_READERS[version](header)
+    if dtype.hasobject or len(shape) != 2 or shape[1] != len(feature_columns):
+        raise ValueError(
+            f"Expected a numeric (rows, {len(feature_columns)}) .npy matrix, got {dtype} {shape}",
+        )
+    values = np.frombuffer(
+        data, dtype=dtype, count=shape[0] * shape[1], offset=header.tell(),
+    ).reshape(shape, order="F" if fortran_order else "C")
+    return pd.DataFrame(values, columns=feature_columns, copy=False)
+
+
+_DECODERS = {
+    "csv": _decode_csv,
+    "parquet": _decode_parquet,
+    "arrow": _decode_arrow,
+    "npy": _decode_npy,
+}
+
+
+def decode_upload(
+    upload: UploadFile,
+    feature_columns: list[str],
+    schema_types: SchemaTypes | None = None,
+) -> pd.DataFrame:
+    """
+    Decode an uploaded feature file into a DataFrame.
+
+    Args:
+      upload: file part of the request; its content type (or file suffix) selects
+        CSV, Parquet, Arrow IPC stream or .npy
+      feature_columns: schema feature order, used to name .npy columns
+      schema_types: if given, the decoded columns are cast to their compact
+        dtypes and values outside the schema domain are rejected
+
+    """
+    try:
+        dataframe = _DECODERS[upload_format(upload)](upload.file, feature_columns)
+        if schema_types is not None:
+            dataframe = schema_types.enforce(dataframe)
+        return dataframe
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
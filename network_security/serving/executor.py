@@ -0,0 +1,186 @@
+import asyncio
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+from network_security.serving.metrics import ServingMetrics
+from network_security.serving.model_holder import ModelHolder
+from network_security.serving.prediction_cache import PredictionCache
+
+## model holder and prediction cache of a process pool worker, created by _init_worker
+_worker_model_holder: ModelHolder | None = None
+_worker_prediction_cache: PredictionCache | None = None
+
+
+def _init_worker(
+    preprocessor_file_path: Path,
+    model_file_path: Path,
+    poll_interval: float,
+    use_compiled_model: bool,
+    prediction_cache_max_entries: int,
+    warmup_batch: pd.DataFrame | None,
+) -> None:
+    """Preload and warm up the model once per worker process and keep it hot-reloaded."""
+    global _worker_model_holder, _worker_prediction_cache
+    _worker_model_holder = ModelHolder(
+        preprocessor_file_path=preprocessor_file_path,
+        model_file_path=model_file_path,
+        poll_interval=poll_interval,
+        use_compiled_model=use_compiled_model,
+        warmup_batch=warmup_batch,
+    )
+    _worker_prediction_cache = PredictionCache(max_entries=prediction_cache_max_entries)
+    _worker_model_holder.add_reload_listener(_worker_prediction_cache.reset)
+    _worker_model_holder.load()
+    _worker_model_holder.start_watcher()
+
+
+def _worker_ready() -> str | None:
+    return _worker_model_holder.version
+
+
+def _predict_in_worker(dataframe: pd.DataFrame) -> tuple[np.ndarray, dict]:
+    timings = {}
+    y_hat = _worker_prediction_cache.predict(_worker_model_holder.get(), dataframe, timings)
+    return y_hat, timings
+
+
+class InferenceExecutor:
+    """
+    Runs NetworkModel.predict on a dedicated thread or process pool.
+
+    Thread pools share the caller's ModelHolder. Process pools are spawned (not
+    forked, the server already runs threads) and every worker preloads its own
+    model through _init_worker. Queue depth is derived from per-call counters,
+    so it is available for both pool kinds.
+
+    Predictions go through a PredictionCache: the shared one passed in for
+    thread pools, and a private one of the same size per worker process.
+    Preprocessor and model timings of every call are sent back with the result
+    and recorded in the optional ServingMetrics by the caller's process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        max_workers: int,
+        model_holder: ModelHolder,
+        prediction_cache: PredictionCache,
+        metrics: ServingMetrics | None = None,
+    ) -> None:
+        try:
+            self.name = name
+            self.kind = kind
+            self.max_workers = max_workers
+            self.model_holder = model_holder
+            self.prediction_cache = prediction_cache
+            self.metrics = metrics
+            self._pool: Executor | None = None
+            ## serializes start(): a second caller must not spawn a second pool
+            self._start_lock = threading.Lock()
+
+            self._counter_lock = threading.Lock()
+            self._submitted = 0
+            self._completed = 0
+            self._failed = 0
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def start(self) -> None:
+        try:
+            with self._start_lock:
+                if self._pool is not None:
+                    return
+                self._pool = self._create_pool()
+            logging.info(
+                f"Started {self.kind} inference pool {self.name} with {self.max_workers} workers",
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _create_pool(self) -> Executor:
+        if self.kind == "thread":
+            return ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"inference-{self.name}",
+            )
+        if self.kind == "process":
+            pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    self.model_holder.preprocessor_file_path,
+                    self.model_holder.model_file_path,
+                    self.model_holder.poll_interval,
+                    self.model_holder.use_compiled_model,
+                    self.prediction_cache.max_entries,
+                    self.model_holder.warmup_batch,
+                ),
+            )
+            ## one warm-up task per worker makes the pool spawn all of them
+            ## now instead of on the first requests
+            try:
+                warmups = [pool.submit(_worker_ready) for _ in range(self.max_workers)]
+                versions = {warmup.result() for warmup in warmups}
+            except Exception:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            logging.info(f"Inference pool {self.name} preloaded model versions {versions}")
+            return pool
+        raise ValueError(f"Unknown inference executor kind: {self.kind}")
+
+    def shutdown(self) -> None:
+        with self._start_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _predict_in_thread(self, dataframe: pd.DataFrame) -> tuple[np.ndarray, dict]:
+        timings = {}
+        y_hat = self.prediction_cache.predict(self.model_holder.get(), dataframe, timings)
+        return y_hat, timings
+
+    async def predict(self, dataframe: pd.DataFrame) -> np.ndarray:
+        """Score a frame on the pool; the event loop only awaits the result."""
+        if self._pool is None:
+            ## starting a process pool blocks for seconds; keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self.start)
+        predict_fn = _predict_in_worker if self.kind == "process" else self._predict_in_thread
+        with self._counter_lock:
+            self._submitted += 1
+        try:
+            y_hat, timings = await asyncio.get_running_loop().run_in_executor(
+                self._pool, predict_fn, dataframe,
+            )
+        except Exception:
+            with self._counter_lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._counter_lock:
+                self._completed += 1
+        if self.metrics is not None:
+            self.metrics.observe_timings(timings)
+        return y_hat
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            in_flight = self._submitted - self._completed
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "in_flight": in_flight,
+                "queue_depth": max(0, in_flight - self.max_workers),
+            }
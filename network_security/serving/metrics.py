@@ -0,0 +1,151 @@
+import bisect
+import math
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.serving.model_holder import ModelHolder
+
+## phases of a /predict call, in request order
+PREDICT_PHASES = (
+    "upload_parse",
+    "preprocessor_transform",
+    "model_predict",
+    "output_write",
+    "html_render",
+)
+
+
+class Histogram:
+    """Cumulative Prometheus histogram; one short lock per observation, not per row."""
+
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = tuple(float(bound) for bound in buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def render(self, name: str, labels: str = "") -> list[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+            cumulative += count
+            le = "+Inf" if math.isinf(bound) else repr(bound)
+            lines.append(f'{name}_bucket{{{labels}le="{le}"}} {cumulative}')
+        label_block = f"{{{labels.rstrip(',')}}}" if labels else ""
+        lines.append(f"{name}_sum{label_block} {total}")
+        lines.append(f"{name}_count{label_block} {cumulative}")
+        return lines
+
+
+class ServingMetrics:
+    """
+    Latency and throughput metrics of the serving API in Prometheus text format.
+
+    Every /predict phase has its own histogram; preprocessor.transform and
+    model.predict are timed inside NetworkModel.predict (also in process pool
+    workers) and reported back per call. Model version and load time are read
+    from the ModelHolder when rendering, so the hot path never touches them.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        model_holder: ModelHolder,
+        latency_buckets: tuple,
+        rows_buckets: tuple,
+    ) -> None:
+        try:
+            self.namespace = namespace
+            self.model_holder = model_holder
+            self.phase_seconds = {phase: Histogram(latency_buckets) for phase in PREDICT_PHASES}
+            self.rows_per_request = Histogram(rows_buckets)
+            ## only changed on the event loop thread, see InFlightRequestsMiddleware
+            self.in_flight_requests = 0
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def observe_phase(self, phase: str, seconds: float) -> None:
+        self.phase_seconds[phase].observe(seconds)
+
+    def observe_timings(self, timings: dict) -> None:
+        for phase, seconds in timings.items():
+            self.observe_phase(phase, seconds)
+
+    def observe_rows(self, rows: int) -> None:
+        self.rows_per_request.observe(rows)
+
+    @contextmanager
+    def time_phase(self, phase: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_phase(phase, time.perf_counter() - started)
+
+    def render(self) -> str:
+        try:
+            prefix = self.namespace
+            lines = [
+                f"# HELP {prefix}_predict_phase_seconds Time spent in each phase of a /predict call.",
+                f"# TYPE {prefix}_predict_phase_seconds histogram",
+            ]
+            for phase, histogram in self.phase_seconds.items():
+                lines += histogram.render(f"{prefix}_predict_phase_seconds", f'phase="{phase}",')
+
+            lines += [
+                f"# HELP {prefix}_predict_rows Rows scored per /predict request.",
+                f"# TYPE {prefix}_predict_rows histogram",
+                *self.rows_per_request.render(f"{prefix}_predict_rows"),
+                f"# HELP {prefix}_in_flight_requests HTTP requests currently being served.",
+                f"# TYPE {prefix}_in_flight_requests gauge",
+                f"{prefix}_in_flight_requests {self.in_flight_requests}",
+            ]
+
+            load_seconds = self.model_holder.load_seconds
+            warmup_seconds = self.model_holder.warmup_seconds
+            version = self.model_holder.version
+            lines += [
+                f"# HELP {prefix}_model_load_seconds Time the last model (re)load took.",
+                f"# TYPE {prefix}_model_load_seconds gauge",
+                f"{prefix}_model_load_seconds {load_seconds if load_seconds is not None else 'NaN'}",
+                f"# HELP {prefix}_model_warmup_seconds Time the warm-up batch of the last model took.",
+                f"# TYPE {prefix}_model_warmup_seconds gauge",
+                f"{prefix}_model_warmup_seconds {warmup_seconds if warmup_seconds is not None else 'NaN'}",
+                f"# HELP {prefix}_model_info Version of the model currently in service.",
+                f"# TYPE {prefix}_model_info gauge",
+                f'{prefix}_model_info{{version="{version or ""}"}} {1 if version else 0}',
+            ]
+            return "\n".join(lines) + "\n"
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+class InFlightRequestsMiddleware:
+    """Plain ASGI middleware counting open HTTP requests on the event loop thread."""
+
+    def __init__(self, app: object, metrics: ServingMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: dict, receive: object, send: object) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.metrics.in_flight_requests += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.metrics.in_flight_requests -= 1
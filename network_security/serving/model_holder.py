@@ -0,0 +1,298 @@
+import hashlib
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from network_security.constant.prediction_pipeline import (
+    FINAL_COMPILED_MODEL_FILE_NAME,
+    FINAL_MODEL_CURRENT_FILE_NAME,
+    FINAL_MODEL_VERSIONS_DIR,
+    MODEL_SERVING_COMPILED_MODEL_MAX_ROWS,
+)
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+from network_security.utils.main_utils.utils import (
+    load_shared_object,
+    read_version_marker,
+    warm_shared_object,
+)
+from network_security.utils.ml_utils.model.compiled_ensemble import (
+    BatchSizeRouter,
+    CompiledTreeEnsemble,
+    compile_model,
+)
+from network_security.utils.ml_utils.model.estimator import NetworkModel
+
+
+def build_warmup_batch(feature_columns: list[str], rows: int) -> pd.DataFrame:
+    """
+    Synthetic feature rows for warming up a freshly loaded model.
+
+    Values cycle through -1, 0 and 1 per column, and every fourth row misses
+    one feature so the imputer runs as well as the model.
+    """
+    values = (np.add.outer(np.arange(rows), np.arange(len(feature_columns))) % 3 - 1).astype(np.float64)
+    values[::4, 0] = np.nan
+    return pd.DataFrame(values, columns=feature_columns)
+
+
+class ModelHolder:
+    """
+    Process-wide holder for the serving NetworkModel.
+
+    The preprocessor and model are unpickled once and served from memory. The
+    pusher publishes every model into its own final_model/versions/<version>/
+    directory and switches the current marker file last (see
+    ModelTrainer.push_model); files are read from the version the marker names,
+    and a watcher thread only reloads when the marker changes, so a push in
+    progress is never half loaded. Without a marker (a final_model/ pushed
+    before versioning) the files given are watched for mtime/size changes and
+    reloaded when their checksum differs. The new model is built completely
+    before it replaces the old one, so requests keep being served by the
+    previous model while a reload is in progress or if the new files fail to
+    load.
+
+    Arrays pushed as shared .npy files (see save_shared_object) are memory
+    mapped read-only, so every process serving the same final_model/ shares
+    one page cache copy. With use_compiled_model, batches of up to
+    MODEL_SERVING_COMPILED_MODEL_MAX_ROWS rows are scored by the
+    compiled_model.pkl pushed next to model.pkl (compiled here if absent) and
+    larger ones by model.pkl itself.
+
+    If a warmup_batch is given, every newly loaded model scores it once before
+    it is put in service, so the first real requests do not pay for lazy
+    initialization.
+    """
+
+    def __init__(
+        self,
+        preprocessor_file_path: Path,
+        model_file_path: Path,
+        poll_interval: float,
+        use_compiled_model: bool = False,
+        warmup_batch: pd.DataFrame | None = None,
+    ) -> None:
+        try:
+            self.preprocessor_file_path = Path(preprocessor_file_path)
+            self.model_file_path = Path(model_file_path)
+            self.compiled_model_file_path = self.model_file_path.with_name(
+                FINAL_COMPILED_MODEL_FILE_NAME,
+            )
+            self.current_file_path = self.model_file_path.with_name(FINAL_MODEL_CURRENT_FILE_NAME)
+            self.poll_interval = poll_interval
+            self.use_compiled_model = use_compiled_model
+            self.warmup_batch = warmup_batch
+
+            self._model: NetworkModel | None = None
+            self._version: str | None = None
+            self._signature: tuple | None = None
+            self._loaded_file_paths: tuple[Path, ...] | None = None
+            self._load_seconds: float | None = None
+            self._warmup_seconds: float | None = None
+            self._loaded_at: float | None = None
+
+            self._reload_lock = threading.Lock()
+            self._reload_listeners: list[Callable[[NetworkModel, str], None]] = []
+            self._stop_event = threading.Event()
+            self._watcher: threading.Thread | None = None
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def version(self) -> str | None:
+        return self._version
+
+    @property
+    def load_seconds(self) -> float | None:
+        return self._load_seconds
+
+    @property
+    def loaded_at(self) -> float | None:
+        return self._loaded_at
+
+    @property
+    def warmup_seconds(self) -> float | None:
+        return self._warmup_seconds
+
+    @property
+    def is_ready(self) -> bool:
+        """A model is in service and has been warmed up (if a warm-up batch is configured)."""
+        return self.is_loaded and (self.warmup_batch is None or self._warmup_seconds is not None)
+
+    def get(self) -> NetworkModel:
+        """Return the model currently in service, loading it on first use."""
+        model = self._model
+        if model is None:
+            self.load()
+            model = self._model
+        return model
+
+    def add_reload_listener(self, listener: Callable[[NetworkModel, str], None]) -> None:
+        """Register a callback invoked with (model, version) after every successful (re)load."""
+        self._reload_listeners.append(listener)
+
+    def _file_paths(self) -> tuple[Path, ...]:
+        if self.use_compiled_model:
+            return (self.preprocessor_file_path, self.model_file_path, self.compiled_model_file_path)
+        return (self.preprocessor_file_path, self.model_file_path)
+
+    def _current_file_paths(self) -> tuple[str | None, tuple[Path, ...]]:
+        """Published version named by the marker and its files; (None, the given files) without a marker."""
+        published_version = read_version_marker(self.current_file_path)
+        if published_version is None:
+            return None, self._file_paths()
+        version_dir = self.model_file_path.parent / FINAL_MODEL_VERSIONS_DIR / published_version
+        return published_version, tuple(version_dir / file_path.name for file_path in self._file_paths())
+
+    @staticmethod
+    def _file_signature(published_version: str | None, file_paths: tuple[Path, ...]) -> tuple:
+        if published_version is not None:
+            ## published versions are immutable, only the marker switches
+            return (published_version,)
+        return tuple(
+            (file_path.stat().st_mtime_ns, file_path.stat().st_size) if file_path.exists() else None
+            for file_path in file_paths
+        )
+
+    @staticmethod
+    def _read_files(file_paths: tuple[Path, ...]) -> list[bytes | None]:
+        return [
+            file_path.read_bytes() if file_path.exists() else None
+            for file_path in file_paths
+        ]
+
+    @staticmethod
+    def _checksum(file_bytes: list[bytes | None]) -> str:
+        checksum = hashlib.sha256()
+        for data in file_bytes:
+            checksum.update(data or b"")
+        return checksum.hexdigest()[:12]
+
+    def peek_version(self) -> str:
+        """Version of the files currently on disk, without loading them."""
+        try:
+            return self._checksum(self._read_files(self._current_file_paths()[1]))
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def load(self) -> NetworkModel:
+        """Unconditionally (re)load the model from disk and put it in service."""
+        try:
+            with self._reload_lock:
+                return self._load_locked(force=True)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def preload(self) -> NetworkModel:
+        """Load the model and pull its memory mapped arrays into the page cache."""
+        try:
+            network_model = self.load()
+            bytes_read = sum(warm_shared_object(file_path) for file_path in self._loaded_file_paths)
+            logging.info(f"Preloaded {bytes_read} bytes of shared model arrays")
+            return network_model
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def refresh(self) -> bool:
+        """
+        Reload the model if the files on disk changed since the last load.
+
+        Returns:
+          True if a new model was put in service.
+
+        """
+        try:
+            with self._reload_lock:
+                if self._signature == self._file_signature(*self._current_file_paths()):
+                    return False
+                previous_version = self._version
+                self._load_locked(force=False)
+                return self._version != previous_version
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _load_locked(self, force: bool) -> NetworkModel:
+        started = time.perf_counter()
+        published_version, file_paths = self._current_file_paths()
+        signature = self._file_signature(published_version, file_paths)
+        file_bytes = self._read_files(file_paths)
+        preprocessor_bytes, model_bytes = file_bytes[:2]
+        compiled_model_bytes = file_bytes[2] if self.use_compiled_model else None
+
+        version = self._checksum(file_bytes)
+
+        if not force and version == self._version:
+            ## files were touched or rewritten with identical content
+            self._signature = signature
+            return self._model
+
+        model = load_shared_object(file_paths[1], model_bytes)
+        if self.use_compiled_model:
+            compiled_model = (
+                load_shared_object(file_paths[2], compiled_model_bytes)
+                if compiled_model_bytes is not None
+                else compile_model(model)
+            )
+            if isinstance(compiled_model, CompiledTreeEnsemble):
+                model = BatchSizeRouter(compiled_model, model, MODEL_SERVING_COMPILED_MODEL_MAX_ROWS)
+        network_model = NetworkModel(
+            preprocessor=load_shared_object(file_paths[0], preprocessor_bytes),
+            model=model,
+        )
+
+        load_seconds = time.perf_counter() - started
+
+        warmup_seconds = None
+        if self.warmup_batch is not None:
+            warmup_started = time.perf_counter()
+            network_model.predict(self.warmup_batch)
+            warmup_seconds = time.perf_counter() - warmup_started
+
+        ## swap only once the new model is fully built and warm
+        self._model = network_model
+        self._version = version
+        self._signature = signature
+        self._loaded_file_paths = file_paths
+        self._load_seconds = load_seconds
+        self._warmup_seconds = warmup_seconds
+        self._loaded_at = time.time()
+        logging.info(
+            f"Loaded model version {version} in {load_seconds:.3f}s"
+            + (f", warm-up took {warmup_seconds:.3f}s" if warmup_seconds is not None else ""),
+        )
+
+        for listener in self._reload_listeners:
+            listener(network_model, version)
+        return network_model
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                ## keep serving the previous model and retry on the next poll
+                logging.info(f"Model reload failed, keeping version {self._version}: {e}")
+
+    def start_watcher(self) -> None:
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_event.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, name="model-holder-watcher", daemon=True,
+        )
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self.poll_interval)
+            self._watcher = None
@@ -0,0 +1,152 @@
+import os
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+from network_security.utils.main_utils.utils import read_yaml_file, write_yaml_file
+
+_OUTPUT_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class PredictionOutputStore:
+    """
+    Per-request prediction result files with bounded retention.
+
+    Every /predict call gets its own <output_id>.csv plus a small <output_id>.yaml
+    summary, both written to a temporary name and renamed into place, so
+    concurrent requests never share a file and readers (in any worker process)
+    either see a complete output or none. After each write the oldest outputs
+    are evicted until the TTL, file count and byte budget are all met.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        max_files: int,
+        max_bytes: int,
+        ttl_seconds: float,
+    ) -> None:
+        try:
+            self.output_dir = Path(output_dir)
+            self.max_files = max_files
+            self.max_bytes = max_bytes
+            self.ttl_seconds = ttl_seconds
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def new_output_id() -> str:
+        return uuid.uuid4().hex
+
+    def _file_path(self, output_id: str, suffix: str) -> Path | None:
+        if not _OUTPUT_ID_PATTERN.match(output_id):
+            return None
+        return self.output_dir / f"{output_id}{suffix}"
+
+    def output_file_path(self, output_id: str) -> Path | None:
+        """Path of a finished output, or None if it does not exist (yet)."""
+        file_path = self._file_path(output_id, ".csv")
+        return file_path if file_path is not None and file_path.exists() else None
+
+    def read_summary(self, output_id: str) -> dict | None:
+        file_path = self._file_path(output_id, ".yaml")
+        if file_path is None or not file_path.exists():
+            return None
+        return read_yaml_file(file_path)
+
+    def read_page(self, output_id: str, page: int, page_size: int) -> pd.DataFrame | None:
+        """Rows of one 1-based page, parsing only up to the end of that page."""
+        try:
+            file_path = self.output_file_path(output_id)
+            if file_path is None:
+                return None
+            start = (page - 1) * page_size
+            page_df = pd.read_csv(
+                file_path, skiprows=range(1, start + 1), nrows=page_size,
+            )
+            page_df.index = range(start, start + len(page_df))
+            return page_df
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def write(self, output_id: str, dataframe: pd.DataFrame, summary: dict) -> None:
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            summary_file_path = self._file_path(output_id, ".yaml")
+            output_file_path = self._file_path(output_id, ".csv")
+
+            ## the summary goes last: an output with a summary is complete, and a
+            ## summary without its csv is an orphan that retention can sweep
+            tmp_output_file_path = output_file_path.with_name(f".{output_file_path.name}.tmp")
+            dataframe.to_csv(tmp_output_file_path, index=False)
+            tmp_output_file_path.replace(output_file_path)
+
+            tmp_summary_file_path = summary_file_path.with_name(f".{summary_file_path.name}.tmp")
+            write_yaml_file(tmp_summary_file_path, summary)
+            tmp_summary_file_path.replace(summary_file_path)
+
+            self.enforce_retention()
+        except Exception as e:
+            ## runs after the response was sent, so there is no caller to raise to
+            logging.info(f"Writing prediction output {output_id} failed: {e}")
+
+    def _list_outputs(self) -> dict[str, dict[str, os.stat_result]]:
+        """Stat of the .csv and .yaml file of every output, by output id."""
+        outputs: dict[str, dict[str, os.stat_result]] = {}
+        for file_path in self.output_dir.iterdir():
+            if file_path.suffix not in (".csv", ".yaml") or not _OUTPUT_ID_PATTERN.match(file_path.stem):
+                continue
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
+                ## evicted concurrently by another request or worker
+                continue
+            outputs.setdefault(file_path.stem, {})[file_path.suffix] = stat
+        return outputs
+
+    def _evict(self, output_id: str) -> None:
+        ## the summary first, so readers stop finding the output before its csv goes
+        self._file_path(output_id, ".yaml").unlink(missing_ok=True)
+        self._file_path(output_id, ".csv").unlink(missing_ok=True)
+
+    def enforce_retention(self) -> None:
+        """
+        Evict whole outputs (csv and summary together), oldest first.
+
+        Age and size of an output cover both of its files. Summaries whose csv
+        is gone (e.g. outputs written before the csv went first, or a csv
+        removed by hand) are swept on every pass.
+        """
+        now = time.time()
+        outputs = []
+        orphans = 0
+        for output_id, stats in self._list_outputs().items():
+            if ".csv" not in stats:
+                self._evict(output_id)
+                orphans += 1
+                continue
+            mtime = max(stat.st_mtime for stat in stats.values())
+            size = sum(stat.st_size for stat in stats.values())
+            outputs.append((mtime, size, output_id))
+        outputs.sort()
+
+        total_bytes = sum(size for _, size, _ in outputs)
+        evicted = 0
+        for mtime, size, output_id in outputs:
+            if (
+                now - mtime <= self.ttl_seconds
+                and len(outputs) - evicted <= self.max_files
+                and total_bytes <= self.max_bytes
+            ):
+                break
+            self._evict(output_id)
+            total_bytes -= size
+            evicted += 1
+        if evicted or orphans:
+            logging.info(f"Evicted {evicted} prediction outputs and {orphans} orphaned summaries")
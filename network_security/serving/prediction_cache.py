@@ -0,0 +1,159 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.utils.ml_utils.model.estimator import NetworkModel
+
+## 2 bits per feature: -1, 0, 1 and NaN map to codes 0, 1, 2 and 3
+_MISSING_CODE = 3
+_MAX_ENCODED_FEATURES = 32
+
+
+def encode_feature_rows(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pack every ternary feature row into one uint64 key.
+
+    Integer and float matrices are encoded as they are; only float rows can
+    hold NaN.
+
+    Returns:
+      (keys, cacheable) where cacheable is False for rows holding a value outside
+      {-1, 0, 1, NaN}; their key is meaningless.
+
+    """
+    if values.dtype.kind == "f":
+        missing = np.isnan(values)
+        cacheable = (missing | np.isin(values, (-1, 0, 1))).all(axis=1)
+        codes = np.where(missing, _MISSING_CODE, np.nan_to_num(values) + 1)
+    else:
+        ## integer (e.g. int8 from SchemaTypes) rows hold no NaN and need no float copy
+        cacheable = ((values >= -1) & (values <= 1)).all(axis=1)
+        codes = values.astype(np.int64) + 1
+    codes = np.where(cacheable[:, None], codes, 0).astype(np.uint64)
+    shifts = np.arange(0, 2 * values.shape[1], 2, dtype=np.uint64)
+    keys = np.bitwise_or.reduce(codes << shifts, axis=1)
+    return keys, cacheable
+
+
+def select_model_features(network_model: NetworkModel, x: object) -> object:
+    """
+    Restrict a frame to the model's feature columns, in the model's order.
+
+    The cache key is built from the column positions, so a permuted or
+    widened upload must be aligned before it is encoded. Arrays carry no
+    names and are taken to be in feature order already.
+    """
+    feature_names = getattr(network_model.preprocessor, "feature_names_in_", None)
+    if (
+        isinstance(x, pd.DataFrame)
+        and feature_names is not None
+        and not np.array_equal(x.columns, feature_names)
+    ):
+        return x[list(feature_names)]
+    return x
+
+
+def _take_rows(x: object, rows: np.ndarray) -> object:
+    return x.iloc[rows] if isinstance(x, pd.DataFrame) else np.asarray(x)[rows]
+
+
+class PredictionCache:
+    """
+    Size-bounded LRU cache of predictions keyed on the encoded feature row.
+
+    Hits skip imputation and model evaluation entirely; the misses of a batch
+    are de-duplicated and scored with one vectorized predict call. The cache
+    belongs to one model instance: reset() (registered as a ModelHolder reload
+    listener) clears it for the new model, and batches still running on an older
+    model bypass it instead of polluting it.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        try:
+            self.max_entries = max_entries
+            self._entries: OrderedDict[int, object] = OrderedDict()
+            self._owner: NetworkModel | None = None
+            self._lock = threading.Lock()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def reset(self, network_model: NetworkModel, version: str | None = None) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._owner = network_model
+
+    def predict(
+        self, network_model: NetworkModel, x: object, timings: dict | None = None,
+    ) -> np.ndarray:
+        """Score x through the cache; timings is passed on to NetworkModel.predict for the misses."""
+        try:
+            x = select_model_features(network_model, x)
+            values = np.asarray(x)
+            if values.dtype.kind not in "biuf":
+                values = values.astype(np.float64)
+            if self.max_entries <= 0 or values.shape[1] > _MAX_ENCODED_FEATURES:
+                return network_model.predict(x, timings)
+            keys, cacheable = encode_feature_rows(values)
+            key_list = keys.tolist()
+
+            with self._lock:
+                if self._owner is None:
+                    self._owner = network_model
+                is_owner = network_model is self._owner
+                cached = [None] * len(key_list)
+                if is_owner:
+                    for row, (key, ok) in enumerate(zip(key_list, cacheable.tolist(), strict=True)):
+                        if ok and key in self._entries:
+                            self._entries.move_to_end(key)
+                            cached[row] = self._entries[key]
+            if not is_owner:
+                return network_model.predict(x, timings)
+
+            hit = np.fromiter((value is not None for value in cached), dtype=bool, count=len(cached))
+            miss_rows = np.flatnonzero(~hit & cacheable)
+            uncacheable_rows = np.flatnonzero(~cacheable)
+            miss_keys, first_rows, inverse = np.unique(
+                keys[miss_rows], return_index=True, return_inverse=True,
+            )
+            score_rows = np.concatenate([miss_rows[first_rows], uncacheable_rows])
+
+            y_hat = np.empty(len(key_list), dtype=object)
+            y_hat[hit] = [value for value in cached if value is not None]
+            if len(score_rows):
+                scored = network_model.predict(_take_rows(x, score_rows), timings)
+                y_hat[miss_rows] = scored[: len(miss_keys)][inverse]
+                y_hat[uncacheable_rows] = scored[len(miss_keys) :]
+                self._store(network_model, miss_keys.tolist(), scored[: len(miss_keys)].tolist())
+
+            with self._lock:
+                self._hits += int(hit.sum())
+                self._misses += len(key_list) - int(hit.sum())
+            return np.asarray(y_hat.tolist())
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _store(self, network_model: NetworkModel, keys: list, predictions: list) -> None:
+        with self._lock:
+            if network_model is not self._owner:
+                return
+            self._entries.update(zip(keys, predictions, strict=True))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_entries": self.max_entries,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
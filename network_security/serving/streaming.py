@@ -0,0 +1,118 @@
+import io
+import sys
+import zlib
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import BinaryIO
+
+import numpy as np
+import pandas as pd
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from network_security.constant.prediction_pipeline import PREDICTION_COLUMN_NAME
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+from network_security.utils.main_utils.schema_types import SchemaTypes
+
+
+def detach_upload(upload: UploadFile) -> BinaryIO:
+    """
+    Take ownership of the spooled file behind an UploadFile.
+
+    FastAPI closes uploaded files as soon as the route returns, which is before a
+    StreamingResponse body is consumed. Swapping in an empty buffer lets the
+    framework close that instead, while the returned file stays open until the
+    stream closes it.
+    """
+    source = upload.file
+    upload.file = io.BytesIO()
+    source.seek(0)
+    return source
+
+
+def _encode_chunk(dataframe: pd.DataFrame, output_format: str, include_header: bool) -> bytes:
+    if output_format == "ndjson":
+        records = dataframe.to_json(orient="records", lines=True).rstrip("\n")
+        return (records + "\n").encode()
+    return dataframe.to_csv(index=False, header=include_header).encode()
+
+
+def _next_chunk(chunks: Iterator[pd.DataFrame], schema_types: SchemaTypes | None) -> pd.DataFrame | None:
+    chunk = next(chunks, None)
+    if chunk is not None and schema_types is not None:
+        chunk = schema_types.enforce(chunk)
+    return chunk
+
+
+async def stream_predictions(
+    source: BinaryIO,
+    predict_fn: Callable[[pd.DataFrame], Awaitable[np.ndarray]],
+    chunk_size: int,
+    output_format: str = "csv",
+    compress: bool = False,
+    schema_types: SchemaTypes | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Parse a CSV upload in bounded chunks and yield the scored rows.
+
+    Only one chunk of input and its encoded output are held in memory at a time,
+    so memory stays flat regardless of the upload size. Parsing, typing and
+    encoding run on the threadpool; scoring is awaited on predict_fn (the
+    upload InferenceExecutor), so chunks share its pool, prediction cache and
+    metrics with /predict.
+
+    Args:
+      source: binary file object holding the CSV upload, closed when done
+      predict_fn: awaitable scorer of one chunk
+      chunk_size: number of rows parsed and scored per chunk
+      output_format: "csv" or "ndjson"
+      compress: gzip the byte stream
+      schema_types: if given, every chunk is typed and checked against the schema
+
+    Yields:
+      Encoded (and optionally gzip compressed) output bytes
+
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+    total_rows = 0
+    try:
+        with source:
+            chunks = await run_in_threadpool(
+                pd.read_csv, source, chunksize=chunk_size, na_values=["na"],
+            )
+            chunk_number = 0
+            while (chunk := await run_in_threadpool(_next_chunk, chunks, schema_types)) is not None:
+                chunk[PREDICTION_COLUMN_NAME] = await predict_fn(chunk)
+                total_rows += len(chunk)
+                payload = await run_in_threadpool(
+                    _encode_chunk, chunk, output_format, chunk_number == 0,
+                )
+                chunk_number += 1
+                if compressor is not None:
+                    payload = compressor.compress(payload)
+                if payload:
+                    yield payload
+            if compressor is not None:
+                yield compressor.flush()
+        logging.info(f"Streamed predictions for {total_rows} rows as {output_format}")
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+async def prime_stream(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Run stream up to its first payload and return an iterator over all of it.
+
+    Errors of the first chunk (an undecodable upload, values outside the
+    schema) are raised here, while the route can still answer with an error
+    status instead of a truncated 200.
+    """
+    first_payload = await anext(stream, None)
+
+    async def primed() -> AsyncIterator[bytes]:
+        if first_payload is not None:
+            yield first_payload
+        async for payload in stream:
+            yield payload
+
+    return primed()
@@ -0,0 +1,301 @@
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+from network_security.utils.main_utils.schema_types import SchemaTypes
+
+
+class ArtifactWriter:
+    """Appends DataFrame chunks to one artifact file; close() finishes the file."""
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class ArtifactFormat:
+    """On-disk format of the tabular artifacts exchanged between pipeline stages."""
+
+    name: str = ""
+    suffix: str = ""
+
+    def write(self, dataframe: pd.DataFrame, file_path: Path) -> None:
+        raise NotImplementedError
+
+    def read(self, file_path: Path) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def open_writer(self, file_path: Path, schema_types: SchemaTypes | None) -> ArtifactWriter:
+        raise NotImplementedError
+
+
+class _CsvArtifactWriter(ArtifactWriter):
+    def __init__(self, file_path: Path) -> None:
+        self._file_obj = Path(file_path).open("w", newline="")
+        self._header = True
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        dataframe.to_csv(self._file_obj, index=False, header=self._header)
+        self._header = False
+
+    def close(self) -> None:
+        self._file_obj.close()
+
+
+class CsvArtifactFormat(ArtifactFormat):
+    name = "csv"
+    suffix = ".csv"
+
+    def write(self, dataframe: pd.DataFrame, file_path: Path) -> None:
+        dataframe.to_csv(file_path, index=False, header=True)
+
+    def read(self, file_path: Path) -> pd.DataFrame:
+        return pd.read_csv(file_path, na_values=["na"])
+
+    def open_writer(self, file_path: Path, schema_types: SchemaTypes | None) -> ArtifactWriter:
+        return _CsvArtifactWriter(file_path)
+
+
+class _ParquetArtifactWriter(ArtifactWriter):
+    """
+    One row group per chunk.
+
+    The file schema is fixed by the first chunk, except that schema columns
+    get their compact dtype as a nullable Arrow type: a column can then be
+    int8 in one chunk and float32 with NaN in the next (stored as int8 nulls).
+    """
+
+    def __init__(self, file_path: Path, schema_types: SchemaTypes | None) -> None:
+        self.file_path = file_path
+        self.schema_types = schema_types
+        self._writer = None
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            schema = pa.Schema.from_pandas(dataframe, preserve_index=False).remove_metadata()
+            dtypes = self.schema_types.dtypes if self.schema_types is not None else {}
+            for index, field in enumerate(schema):
+                if field.name in dtypes:
+                    schema = schema.set(index, field.with_type(pa.from_numpy_dtype(dtypes[field.name])))
+            self._writer = pq.ParquetWriter(self.file_path, schema, compression="zstd")
+        self._writer.write_table(
+            pa.Table.from_pandas(dataframe, schema=self._writer.schema, preserve_index=False),
+        )
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ParquetArtifactFormat(ArtifactFormat):
+    name = "parquet"
+    suffix = ".parquet"
+
+    def write(self, dataframe: pd.DataFrame, file_path: Path) -> None:
+        dataframe.to_parquet(file_path, index=False, compression="zstd")
+
+    def read(self, file_path: Path) -> pd.DataFrame:
+        return pd.read_parquet(file_path)
+
+    def open_writer(self, file_path: Path, schema_types: SchemaTypes | None) -> ArtifactWriter:
+        return _ParquetArtifactWriter(file_path, schema_types)
+
+
+class _NpzArtifactWriter(ArtifactWriter):
+    """Every chunk becomes one part: a p<part>_c<index> member per column."""
+
+    def __init__(self, file_path: Path) -> None:
+        self._archive = zipfile.ZipFile(file_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._columns: list[str] | None = None
+        self._parts = 0
+
+    def _write_member(self, name: str, array: np.ndarray) -> None:
+        with self._archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+            np.lib.format.write_array(member, array, allow_pickle=False)
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        if self._columns is None:
+            self._columns = list(dataframe.columns)
+        for index, column in enumerate(self._columns):
+            self._write_member(f"p{self._parts}_c{index}", dataframe[column].to_numpy())
+        self._parts += 1
+
+    def close(self) -> None:
+        self._write_member("__columns__", np.asarray(self._columns or [], dtype=str))
+        self._archive.close()
+
+
+class NpzArtifactFormat(ArtifactFormat):
+    """
+    One compressed .npy member per column, in a single .npz archive.
+
+    Artifacts written chunk by chunk hold one set of members per chunk
+    (p<part>_c<index>), concatenated again on read.
+    """
+
+    name = "npz"
+    suffix = ".npz"
+
+    def write(self, dataframe: pd.DataFrame, file_path: Path) -> None:
+        with Path(file_path).open("wb") as file_obj:
+            np.savez_compressed(
+                file_obj,
+                __columns__=np.asarray(dataframe.columns, dtype=str),
+                **{f"c{index}": dataframe[column].to_numpy() for index, column in enumerate(dataframe.columns)},
+            )
+
+    def read(self, file_path: Path) -> pd.DataFrame:
+        with np.load(file_path) as archive:
+            columns = archive["__columns__"].tolist()
+            if "c0" in archive.files or not columns:
+                return pd.DataFrame(
+                    {column: archive[f"c{index}"] for index, column in enumerate(columns)},
+                    copy=False,
+                )
+            n_parts = sum(name.endswith("_c0") for name in archive.files)
+            parts = [
+                pd.DataFrame(
+                    {column: archive[f"p{part}_c{index}"] for index, column in enumerate(columns)},
+                    copy=False,
+                )
+                for part in range(n_parts)
+            ]
+            return parts[0] if n_parts == 1 else pd.concat(parts, ignore_index=True)
+
+    def open_writer(self, file_path: Path, schema_types: SchemaTypes | None) -> ArtifactWriter:
+        return _NpzArtifactWriter(file_path)
+
+
+ARTIFACT_FORMATS: dict[str, ArtifactFormat] = {
+    artifact_format.name: artifact_format
+    for artifact_format in (CsvArtifactFormat(), ParquetArtifactFormat(), NpzArtifactFormat())
+}
+
+
+def get_artifact_format(name: str) -> ArtifactFormat:
+    try:
+        return ARTIFACT_FORMATS[name]
+    except KeyError as e:
+        raise NetworkSecurityException(
+            ValueError(f"Unknown artifact format {name!r}, expected one of {sorted(ARTIFACT_FORMATS)}"),
+            sys,
+        ) from e
+
+
+def write_dataframe(
+    file_path: str,
+    dataframe: pd.DataFrame,
+    artifact_format: str,
+    schema_types: SchemaTypes | None = None,
+) -> None:
+    """
+    Write a stage artifact atomically in the given format, logging wall time and bytes.
+
+    file_path: location of the artifact, its suffix should match the format
+    dataframe: data to save, typed and checked by schema_types first if given
+    """
+    try:
+        started = time.perf_counter()
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file_path = file_path.with_name(f".{file_path.name}.tmp")
+        if schema_types is not None:
+            dataframe = schema_types.enforce(dataframe)
+        get_artifact_format(artifact_format).write(dataframe, tmp_file_path)
+        tmp_file_path.replace(file_path)
+        logging.info(
+            f"Wrote {file_path} ({artifact_format}, {len(dataframe)} rows, "
+            f"{file_path.stat().st_size} bytes) in {time.perf_counter() - started:.3f}s",
+        )
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+class DataFrameWriter:
+    """
+    Stage artifact written chunk by chunk, as a context manager.
+
+    Chunks are typed by schema_types, appended to a temporary file (a row group
+    per chunk for parquet, a part per chunk for npz) and the artifact appears
+    atomically when the block exits; if it raises, nothing is published.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        artifact_format: str,
+        schema_types: SchemaTypes | None = None,
+    ) -> None:
+        try:
+            self.file_path = Path(file_path)
+            self.artifact_format = artifact_format
+            self.schema_types = schema_types
+            self.rows = 0
+            self._tmp_file_path = self.file_path.with_name(f".{self.file_path.name}.tmp")
+            self._writer: ArtifactWriter | None = None
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def __enter__(self) -> "DataFrameWriter":
+        try:
+            self._started = time.perf_counter()
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = get_artifact_format(self.artifact_format).open_writer(
+                self._tmp_file_path, self.schema_types,
+            )
+            return self
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        try:
+            if self.schema_types is not None:
+                dataframe = self.schema_types.enforce(dataframe)
+            self._writer.write(dataframe)
+            self.rows += len(dataframe)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def __exit__(self, exc_type: type | None, exc_value: object, traceback: object) -> None:
+        try:
+            self._writer.close()
+        finally:
+            if exc_type is not None:
+                self._tmp_file_path.unlink(missing_ok=True)
+        if exc_type is None:
+            self._tmp_file_path.replace(self.file_path)
+            logging.info(
+                f"Wrote {self.file_path} ({self.artifact_format}, {self.rows} rows, "
+                f"{self.file_path.stat().st_size} bytes) in {time.perf_counter() - self._started:.3f}s",
+            )
+
+
+def read_dataframe(
+    file_path: str,
+    artifact_format: str,
+    schema_types: SchemaTypes | None = None,
+) -> pd.DataFrame:
+    """Read a stage artifact written by write_dataframe, logging wall time and bytes."""
+    try:
+        started = time.perf_counter()
+        dataframe = get_artifact_format(artifact_format).read(Path(file_path))
+        if schema_types is not None:
+            dataframe = schema_types.enforce(dataframe)
+        logging.info(
+            f"Read {file_path} ({artifact_format}, {len(dataframe)} rows, "
+            f"{Path(file_path).stat().st_size} bytes) in {time.perf_counter() - started:.3f}s",
+        )
+        return dataframe
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
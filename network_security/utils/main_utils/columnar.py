@@ -0,0 +1,120 @@
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from network_security.exception.exception import NetworkSecurityException
+
+## int8 cell value marking a missing ("na" / null) value while filling
+INT8_MISSING = np.iinfo(np.int8).min
+
+
+def _to_float(value: object) -> float:
+    if value is None or value == "na":
+        return np.nan
+    return float(value)
+
+
+class ColumnarBuffer:
+    """
+    Preallocated per-column arrays filled batch by batch from documents.
+
+    Columns start as int8, with missing values ("na" or null) kept as
+    INT8_MISSING. A column that receives a value int8 cannot represent is
+    promoted to float64 once and stays float. to_dataframe() turns int8
+    columns that saw a missing value into float32 with NaN; all others stay
+    int8, so a ternary feature matrix costs one byte per cell.
+
+    Rows are handed out with allocate(); several threads may write batches
+    to disjoint allocated ranges concurrently.
+    """
+
+    def __init__(self, columns: list[str], capacity: int) -> None:
+        try:
+            self.columns = list(columns)
+            self.capacity = max(int(capacity), 1)
+            self._arrays = {
+                column: np.empty(self.capacity, dtype=np.int8) for column in self.columns
+            }
+            self._has_missing = dict.fromkeys(self.columns, False)
+            self._allocated = 0
+            self._lock = threading.Lock()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @property
+    def allocated_rows(self) -> int:
+        return self._allocated
+
+    def allocate(self, rows: int) -> int:
+        """
+        Reserve the next rows rows, growing the columns (by doubling) if needed.
+
+        Returns:
+          index of the first reserved row
+
+        """
+        with self._lock:
+            start = self._allocated
+            self._allocated += rows
+            if self._allocated > self.capacity:
+                new_capacity = max(self._allocated, 2 * self.capacity)
+                for column, array in self._arrays.items():
+                    grown = np.empty(new_capacity, dtype=array.dtype)
+                    grown[: self.capacity] = array
+                    self._arrays[column] = grown
+                self.capacity = new_capacity
+            return start
+
+    def _promote_locked(self, column: str) -> None:
+        array = self._arrays[column]
+        promoted = array.astype(np.float64)
+        promoted[array == INT8_MISSING] = np.nan
+        self._arrays[column] = promoted
+
+    def write(self, start: int, documents: list[dict]) -> int:
+        """Fill rows [start, start + len(documents)) and return the number of rows written."""
+        try:
+            end = start + len(documents)
+            for column in self.columns:
+                ## the per-document conversion runs outside the lock, only the
+                ## vectorized store into the shared array is serialized
+                values = np.fromiter(
+                    (_to_float(document.get(column)) for document in documents),
+                    dtype=np.float64,
+                    count=len(documents),
+                )
+                missing = np.isnan(values)
+                present = values[~missing]
+                fits_int8 = bool(
+                    (present == np.round(present)).all()
+                    and (np.abs(present) <= np.iinfo(np.int8).max).all(),
+                )
+                int8_values = (
+                    np.where(missing, INT8_MISSING, values).astype(np.int8) if fits_int8 else None
+                )
+                with self._lock:
+                    if missing.any():
+                        self._has_missing[column] = True
+                    if self._arrays[column].dtype == np.int8 and not fits_int8:
+                        self._promote_locked(column)
+                    array = self._arrays[column]
+                    array[start:end] = int8_values if array.dtype == np.int8 else values
+            return len(documents)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def to_dataframe(self, rows: int) -> pd.DataFrame:
+        try:
+            columns = {}
+            for column, array in self._arrays.items():
+                array = array[:rows]
+                if array.dtype == np.int8 and self._has_missing[column]:
+                    missing = array == INT8_MISSING
+                    array = array.astype(np.float32)
+                    array[missing] = np.nan
+                columns[column] = array
+            return pd.DataFrame(columns, copy=False)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
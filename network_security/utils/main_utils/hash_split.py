@@ -0,0 +1,76 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from network_security.exception.exception import NetworkSecurityException
+
+
+def row_hash_fractions(
+    dataframe: pd.DataFrame,
+    hash_key: str,
+    key_columns: list[str] | None = None,
+) -> np.ndarray:
+    """
+    Map every row to a stable number in [0, 1) from a hash of its key columns.
+
+    The values are cast to float64 before hashing, so a row hashes the same
+    whether its columns were loaded as int8 or as float32 with NaN, in
+    whatever chunk it arrives.
+
+    hash_key: 16 character key of the hash; another key gives another split
+    key_columns: columns identifying a row (e.g. an id); None hashes the whole row
+    """
+    try:
+        keys = dataframe if key_columns is None else dataframe[key_columns]
+        hashes = pd.util.hash_pandas_object(
+            keys.astype(np.float64), index=False, hash_key=hash_key,
+        ).to_numpy()
+        ## the top 53 bits are exactly representable as a float64 fraction
+        return (hashes >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def hash_split(
+    dataframe: pd.DataFrame,
+    test_ratio: float,
+    hash_key: str,
+    key_columns: list[str] | None = None,
+    stratify_column: str | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split dataframe into (train, test) by a stable hash of each row.
+
+    Without stratification a row is a test row when its hash fraction is
+    below test_ratio, independent of every other row: chunks of a stream can
+    be split one at a time, and a row keeps its side across runs and
+    incremental loads. With stratify_column, each class of the chunk puts
+    its round(test_ratio * n) rows with the lowest hash fractions into test,
+    which keeps the class balance per chunk; the assignment is then stable
+    as long as the chunks are (e.g. immutable feature store partitions).
+
+    Identical key rows share a hash fraction, so they always land on one
+    side: across all chunks without stratification, within a chunk with it
+    (rows tied at the class cutoff all go to train, so a class can get a
+    few test rows less than round(test_ratio * n)).
+    """
+    try:
+        fractions = row_hash_fractions(dataframe, hash_key, key_columns)
+        if stratify_column is None:
+            is_test = fractions < test_ratio
+        else:
+            is_test = np.zeros(len(dataframe), dtype=bool)
+            codes, labels = pd.factorize(dataframe[stratify_column], use_na_sentinel=False)
+            for code in range(len(labels)):
+                rows = np.flatnonzero(codes == code)
+                test_rows = int(round(test_ratio * len(rows)))
+                if test_rows >= len(rows):
+                    is_test[rows] = True
+                    continue
+                ## rows tied with the first train row (duplicates of it) all stay in train
+                cutoff = np.partition(fractions[rows], test_rows)[test_rows]
+                is_test[rows] = fractions[rows] < cutoff
+        return dataframe[~is_test], dataframe[is_test]
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
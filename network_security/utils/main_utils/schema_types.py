@@ -0,0 +1,97 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.utils.main_utils.utils import read_yaml_file
+
+## compact dtype each schema.yaml column type is held in once loaded
+_STORAGE_DTYPES = {
+    "int64": np.int8,
+    "int32": np.int8,
+    "float64": np.float32,
+}
+## integer columns that still hold NaN (only imputation fills them) use this instead
+_MISSING_DTYPE = np.float32
+## string cells read as missing, as in the raw data and the Mongo documents
+_MISSING_MARKERS = {"na": np.nan}
+
+
+class SchemaTypes:
+    """
+    Typed view of schema.yaml: the compact dtype and allowed values of every column.
+
+    enforce() is the single place DataFrames are typed on load, by the
+    pipeline stages and by /predict: features and target become int8, or
+    float32 while they hold NaN, and values outside allowed_values are rejected.
+    """
+
+    def __init__(self, schema_file_path: str) -> None:
+        try:
+            schema_config = read_yaml_file(schema_file_path)
+            self.dtypes: dict[str, np.dtype] = {
+                column_name: np.dtype(_STORAGE_DTYPES.get(str(column_type).strip(), column_type))
+                for column in schema_config["columns"]
+                for column_name, column_type in column.items()
+            }
+            self.allowed_values = np.asarray(schema_config.get("allowed_values") or [], dtype=np.float64)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _enforce_column(self, values: pd.Series, dtype: np.dtype) -> tuple[np.ndarray, list]:
+        if values.dtype == object:
+            values = pd.to_numeric(values.replace(_MISSING_MARKERS))
+        if isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+            ## nullable columns (e.g. from Parquet or Arrow) carry pd.NA instead of NaN
+            array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            array = values.to_numpy()
+        missing = np.isnan(array) if array.dtype.kind == "f" else None
+        has_missing = missing is not None and bool(missing.any())
+
+        invalid = []
+        if self.allowed_values.size:
+            present = array[~missing] if has_missing else array
+            outside = ~np.isin(present, self.allowed_values)
+            if outside.any():
+                invalid = np.unique(present[outside])[:5].tolist()
+
+        if has_missing and dtype.kind in "iu":
+            dtype = np.dtype(_MISSING_DTYPE)
+        return array.astype(dtype, copy=False), invalid
+
+    def enforce(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cast the schema columns of dataframe to their compact dtypes and check their values.
+
+        Columns that are not in the schema are passed through unchanged. When
+        every schema column already has its compact dtype (e.g. a frame read
+        back from Parquet), the values are only checked and dataframe itself is
+        returned, without a copy.
+
+        Raises:
+          ValueError: a column holds a value outside allowed_values
+
+        """
+        try:
+            columns, invalid = {}, {}
+            changed = False
+            for column in dataframe.columns:
+                dtype = self.dtypes.get(column)
+                if dtype is None:
+                    columns[column] = dataframe[column]
+                    continue
+                columns[column], invalid_values = self._enforce_column(dataframe[column], dtype)
+                changed = changed or columns[column].dtype != dataframe[column].dtype
+                if invalid_values:
+                    invalid[column] = invalid_values
+            if invalid:
+                raise ValueError(
+                    f"Values outside {self.allowed_values.tolist()} in columns: {invalid}",
+                )
+            if not changed:
+                return dataframe
+            return pd.DataFrame(columns, index=dataframe.index, copy=False)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -1,5 +1,8 @@
+import io
 import pickle
+import shutil
 import sys
+import uuid
 from pathlib import Path
 
 import numpy as np
@@ -17,13 +20,33 @@ def read_yaml_file(file_path: str) -> dict:
         raise NetworkSecurityException(e, sys) from e
 
 
+def read_schema_columns(schema_file_path: str) -> list[str]:
+    """Return all column names declared in schema.yaml, in schema order."""
+    try:
+        schema_config = read_yaml_file(schema_file_path)
+        return [column_name for column in schema_config["columns"] for column_name in column]
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def read_schema_feature_columns(schema_file_path: str, target_column: str) -> list[str]:
+    """Return the feature column names declared in schema.yaml, in schema order."""
+    try:
+        return [
+            column_name
+            for column_name in read_schema_columns(schema_file_path)
+            if column_name != target_column
+        ]
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
 def write_yaml_file(file_path: str, content: object, replace: bool = False) -> None:
     try:
         if replace and Path(file_path).exists():
             Path(file_path).unlink()
         with Path(file_path).open("w") as file:
             yaml.dump(content, file)
-            yaml.dump(content, file)
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
@@ -47,8 +70,11 @@ def save_object(file_path: str, obj: object) -> None:
     try:
         logging.info("Entered the save_object method of MainUtils class")
         Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-        with Path(file_path).open("wb") as file_obj:
+        ## write to a temporary file first so readers never see a partial pickle
+        tmp_file_path = Path(file_path).with_name(f".{Path(file_path).name}.tmp")
+        with tmp_file_path.open("wb") as file_obj:
             pickle.dump(obj, file_obj)
+        tmp_file_path.replace(file_path)
         logging.info("Exited the save_object method of MainUtils class")
     except Exception as e:
         raise NetworkSecurityException(e, sys) from e
@@ -65,15 +91,132 @@ def load_object(file_path: str) -> object:
         raise NetworkSecurityException(e, sys) from e
 
 
-def load_numpy_array_data(file_path: str) -> np.array:
+def load_numpy_array_data(file_path: str, mmap_mode: str | None = None) -> np.array:
     """
     Load numpy array data from file
     file_path: str location of file to load
+    mmap_mode: memory map the file instead of reading it, e.g. "r"
     return: np.array data loaded.
     """
     try:
-        with Path(file_path).open("rb") as file_obj:
-            return np.load(file_obj)
+        return np.load(file_path, mmap_mode=mmap_mode)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def _shared_arrays_dir(file_path: str) -> Path:
+    return Path(file_path).with_name(f"{Path(file_path).stem}_arrays")
+
+
+class _SharedArrayPickler(pickle.Pickler):
+    """Pickler that writes large numpy arrays to .npy files instead of the pickle."""
+
+    def __init__(self, file_obj: object, arrays_dir: Path, min_array_bytes: int) -> None:
+        super().__init__(file_obj)
+        self.arrays_dir = arrays_dir
+        self.min_array_bytes = min_array_bytes
+        self.array_count = 0
+        ## arrays referenced twice are written once
+        self._array_names: dict[int, str] = {}
+
+    def persistent_id(self, obj: object) -> str | None:
+        if (
+            not isinstance(obj, np.ndarray)
+            or obj.dtype.hasobject
+            or obj.nbytes < self.min_array_bytes
+        ):
+            return None
+        if id(obj) not in self._array_names:
+            np.save(self.arrays_dir / f"{self.array_count}.npy", obj)
+            self._array_names[id(obj)] = f"{self.arrays_dir.name}/{self.array_count}.npy"
+            self.array_count += 1
+        return self._array_names[id(obj)]
+
+
+class _SharedArrayUnpickler(pickle.Unpickler):
+    def __init__(self, file_obj: object, arrays_root: Path) -> None:
+        super().__init__(file_obj)
+        self.arrays_root = arrays_root
+
+    def persistent_load(self, pid: str) -> np.ndarray:
+        return np.load(self.arrays_root / pid, mmap_mode="r")
+
+
+def save_shared_object(file_path: str, obj: object, min_array_bytes: int) -> None:
+    """
+    Pickle obj with every numpy array of at least min_array_bytes stored as its
+    own .npy file, so load_shared_object can memory map them and all processes
+    on a host share one page cache copy.
+
+    Arrays go to a fresh <stem>_arrays/<token>/ directory and the pickle is
+    renamed into place last, so files that are mapped by running processes are
+    never rewritten. Directories of earlier saves are removed afterwards.
+    """
+    try:
+        arrays_root = _shared_arrays_dir(file_path)
+        arrays_dir = arrays_root / uuid.uuid4().hex
+        arrays_dir.mkdir(parents=True)
+        tmp_file_path = Path(file_path).with_name(f".{Path(file_path).name}.tmp")
+        with tmp_file_path.open("wb") as file_obj:
+            pickler = _SharedArrayPickler(file_obj, arrays_dir, min_array_bytes)
+            pickler.dump(obj)
+        tmp_file_path.replace(file_path)
+        logging.info(f"Saved {file_path} with {pickler.array_count} shared arrays")
+
+        ## unlinking is safe for processes that still map the old files
+        for old_arrays_dir in arrays_root.iterdir():
+            if old_arrays_dir != arrays_dir:
+                shutil.rmtree(old_arrays_dir, ignore_errors=True)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def warm_shared_object(file_path: str) -> int:
+    """Read the shared arrays of file_path once so they sit in the page cache; returns the bytes read."""
+    try:
+        bytes_read = 0
+        arrays_root = _shared_arrays_dir(file_path)
+        if not arrays_root.exists():
+            return 0
+        for array_file_path in arrays_root.rglob("*.npy"):
+            with array_file_path.open("rb") as file_obj:
+                while chunk := file_obj.read(1024 * 1024):
+                    bytes_read += len(chunk)
+        return bytes_read
     except Exception as e:
         raise NetworkSecurityException(e, sys) from e
 
+
+def load_shared_object(file_path: str, data: bytes | None = None) -> object:
+    """
+    Load a pickle written by save_shared_object (or a plain pickle).
+
+    Externalized arrays are memory mapped read-only. data can hold the
+    already read pickle bytes of file_path.
+    """
+    try:
+        if data is None:
+            data = Path(file_path).read_bytes()
+        return _SharedArrayUnpickler(io.BytesIO(data), _shared_arrays_dir(file_path)).load()
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def read_version_marker(file_path: str) -> str | None:
+    """Version name recorded in a marker file, or None if nothing was published yet."""
+    try:
+        if not Path(file_path).exists():
+            return None
+        return Path(file_path).read_text().strip() or None
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def write_version_marker(file_path: str, version: str) -> None:
+    """Atomically point a marker file at version; readers see the old or the new name."""
+    try:
+        tmp_file_path = Path(file_path).with_name(f".{Path(file_path).name}.tmp")
+        tmp_file_path.write_text(f"{version}\n")
+        tmp_file_path.replace(file_path)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
@@ -0,0 +1,58 @@
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+
+
+class WriteBehind:
+    """
+    Background persistence of stage artifacts.
+
+    Stages hand their outputs to the next stage in memory and submit the
+    writes here, so they overlap with the next stage's computation. The
+    submitted objects must not be mutated afterwards. wait() blocks until
+    everything submitted so far is on disk and re-raises the first failure.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        try:
+            self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="write-behind")
+            self._futures: list[Future] = []
+            self._lock = threading.Lock()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def submit(self, function: Callable, *args: object) -> Future:
+        future = self._pool.submit(function, *args)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def wait(self) -> None:
+        try:
+            started = time.perf_counter()
+            with self._lock:
+                futures, self._futures = self._futures, []
+            for future in futures:
+                future.result()
+            if futures:
+                logging.info(
+                    f"Waited {time.perf_counter() - started:.3f}s for {len(futures)} pending artifact writes",
+                )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+def persist(write_behind: WriteBehind | None, function: Callable, *args: object) -> None:
+    """Run function(*args) in the background when a write-behind is given, else right away."""
+    if write_behind is None:
+        function(*args)
+    else:
+        write_behind.submit(function, *args)
@@ -0,0 +1,205 @@
+import sys
+
+import numpy as np
+
+from network_security.exception.exception import NetworkSecurityException
+from network_security.logging.logger import logging
+
+## rows traversed at once; bounds the (rows, trees, outputs) leaf value buffer
+_PREDICT_BLOCK_SIZE = 4096
+
+
+class CompiledTreeEnsemble:
+    """
+    Tree ensemble flattened into NumPy arrays and evaluated batch-at-once.
+
+    All trees share one set of node arrays (feature index, threshold, children,
+    leaf value). A batch is traversed through every tree simultaneously, one
+    vectorized step per level; (row, tree) pairs that reached a leaf (a node
+    that points to itself) leave the working set, so a step only costs the
+    pairs still inside a tree. The ensemble output is init + sum(weights[t] * value[leaf of tree t]), followed by the
+    estimator's decision rule:
+
+      - "argmax": RandomForest / DecisionTree (mean class probability) and
+        AdaBoost SAMME (weighted one-hot votes)
+      - "logit": binary GradientBoosting (positive raw score is classes[1])
+
+    It exposes predict() only, which is what NetworkModel needs. Being plain
+    arrays, it is pushed with save_shared_object and memory mapped when served.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children_left: np.ndarray,
+        children_right: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        weights: np.ndarray,
+        init: np.ndarray,
+        classes: np.ndarray,
+        max_depth: int,
+        decision: str,
+    ) -> None:
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.roots = roots
+        self.weights = weights
+        self.init = init
+        self.classes = classes
+        self.max_depth = int(max_depth)
+        self.decision = str(decision)
+
+    @classmethod
+    def from_estimator(cls, estimator: object) -> "CompiledTreeEnsemble":
+        """
+        Compile a fitted sklearn tree model.
+
+        Raises:
+          ValueError: if the estimator is not a supported tree model
+
+        """
+        ## sklearn is only needed to compile, not to serve a compiled model
+        from sklearn.ensemble import (
+            AdaBoostClassifier,
+            GradientBoostingClassifier,
+            RandomForestClassifier,
+        )
+        from sklearn.tree import DecisionTreeClassifier
+
+        if isinstance(estimator, DecisionTreeClassifier):
+            trees = [estimator.tree_]
+            values = [_class_probabilities(estimator.tree_)]
+            weights = np.ones(1)
+            decision = "argmax"
+        elif isinstance(estimator, RandomForestClassifier):
+            trees = [tree.tree_ for tree in estimator.estimators_]
+            values = [_class_probabilities(tree) for tree in trees]
+            weights = np.full(len(trees), 1.0 / len(trees))
+            decision = "argmax"
+        elif isinstance(estimator, AdaBoostClassifier):
+            n_classes = len(estimator.classes_)
+            trees = [tree.tree_ for tree in estimator.estimators_]
+            values = [
+                np.eye(n_classes)[_class_probabilities(tree).argmax(axis=1)]
+                for tree in trees
+            ]
+            weights = np.asarray(estimator.estimator_weights_[: len(trees)], dtype=np.float64)
+            decision = "argmax"
+        elif isinstance(estimator, GradientBoostingClassifier):
+            if len(estimator.classes_) != 2 or estimator.init not in (None, "zero"):
+                raise ValueError("Only binary GradientBoosting with the default init is supported")
+            trees = [stage[0].tree_ for stage in estimator.estimators_]
+            values = [tree.value[:, 0, :1] for tree in trees]
+            weights = np.full(len(trees), estimator.learning_rate)
+            decision = "logit"
+        else:
+            raise ValueError(f"Cannot compile {type(estimator).__name__}")
+
+        n_outputs = values[0].shape[1]
+        feature, threshold, children_left, children_right, value, roots = (
+            [], [], [], [], [], [],
+        )
+        offset = 0
+        for tree, tree_value in zip(trees, values, strict=True):
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, 0.0, tree.threshold))
+            children_left.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            children_right.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            value.append(tree_value)
+            offset += tree.node_count
+
+        compiled = cls(
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            children_left=np.concatenate(children_left).astype(np.int32),
+            children_right=np.concatenate(children_right).astype(np.int32),
+            value=np.concatenate(value).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            weights=weights,
+            init=np.zeros(n_outputs),
+            classes=np.asarray(estimator.classes_),
+            max_depth=max(tree.max_depth for tree in trees),
+            decision=decision,
+        )
+        if decision == "logit":
+            ## the default init is a constant prior; recover it from one probe row
+            probe = np.zeros((1, estimator.n_features_in_))
+            compiled.init = estimator.decision_function(probe).reshape(1) - compiled._raw(probe)[0]
+        logging.info(
+            f"Compiled {type(estimator).__name__} into {len(roots)} trees / {offset} nodes",
+        )
+        return compiled
+
+    def _raw(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        n_trees = len(self.roots)
+        ## one (row, tree) pair per entry; pairs that reached a leaf drop out
+        node = np.tile(self.roots, len(x))
+        active = np.arange(len(node))
+        for _ in range(self.max_depth):
+            current = node[active]
+            left = self.children_left[current]
+            inner = left != current
+            active, current, left = active[inner], current[inner], left[inner]
+            if not len(active):
+                break
+            go_left = x[active // n_trees, self.feature[current]] <= self.threshold[current]
+            node[active] = np.where(go_left, left, self.children_right[current])
+        leaf_value = self.value[node].reshape(len(x), n_trees, -1)
+        return self.init + np.einsum("ntk,t->nk", leaf_value, self.weights)
+
+    def predict(self, x: object) -> np.ndarray:
+        try:
+            x = np.asarray(x)
+            raw = np.empty((len(x), len(self.init)))
+            for start in range(0, len(x), _PREDICT_BLOCK_SIZE):
+                raw[start : start + _PREDICT_BLOCK_SIZE] = self._raw(
+                    x[start : start + _PREDICT_BLOCK_SIZE],
+                )
+            if self.decision == "logit":
+                return self.classes[(raw[:, 0] > 0).astype(np.intp)]
+            return self.classes[raw.argmax(axis=1)]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+class BatchSizeRouter:
+    """
+    Score small batches with the compiled ensemble and large ones with the sklearn model.
+
+    The compiled evaluator has far less per-call overhead, sklearn's Cython
+    traversal more throughput; batches of up to max_compiled_rows rows (the
+    measured crossover) go to the compiled one.
+    """
+
+    def __init__(self, compiled_model: CompiledTreeEnsemble, model: object, max_compiled_rows: int) -> None:
+        self.compiled_model = compiled_model
+        self.model = model
+        self.max_compiled_rows = max_compiled_rows
+
+    def predict(self, x: object) -> np.ndarray:
+        if len(x) <= self.max_compiled_rows:
+            return self.compiled_model.predict(x)
+        return self.model.predict(x)
+
+
+def _class_probabilities(tree: object) -> np.ndarray:
+    value = tree.value[:, 0, :]
+    return value / value.sum(axis=1, keepdims=True)
+
+
+def compile_model(model: object) -> object:
+    """Return the compiled equivalent of a tree model, or the model itself if unsupported."""
+    try:
+        return CompiledTreeEnsemble.from_estimator(model)
+    except ValueError as e:
+        logging.info(f"Serving the sklearn model as is: {e}")
+        return model
@@ -1,4 +1,8 @@
 import sys
+import time
+
+import numpy as np
+import pandas as pd
 
 from network_security.exception.exception import NetworkSecurityException
 
@@ -8,13 +12,73 @@ class NetworkModel:
         try:
             self.preprocessor = preprocessor
             self.model = model
+            self.passthrough_complete_rows = self._passes_complete_rows_through()
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def predict(self, x: object) -> object:
+    def _passes_complete_rows_through(self) -> bool:
+        """
+        Check whether the preprocessor leaves rows without missing values unchanged.
+
+        True for the KNNImputer pipeline (unless it dropped all-NaN training
+        columns), which lets predict() skip it for complete rows.
+        """
+        n_features = getattr(self.preprocessor, "n_features_in_", None)
+        if n_features is None:
+            return False
+        probe = np.array([np.zeros(n_features), np.ones(n_features), -np.ones(n_features)])
+        feature_names = getattr(self.preprocessor, "feature_names_in_", None)
+        try:
+            transformed = self.preprocessor.transform(
+                probe if feature_names is None else pd.DataFrame(probe, columns=feature_names),
+            )
+        except Exception:
+            return False
+        return np.array_equal(np.asarray(transformed, dtype=np.float64), probe)
+
+    def predict(self, x: object, timings: dict | None = None) -> object:
+        """
+        Impute and score x.
+
+        If a timings dict is passed, the seconds spent in the preprocessor and in
+        the model are stored under "preprocessor_transform" and "model_predict".
+        """
         try:
-            x_transform = self.preprocessor.transform(x)
-            y_hat = self.model.predict(x_transform)
-            return y_hat
+            started = time.perf_counter()
+            if not getattr(self, "passthrough_complete_rows", False):
+                x_transform = self.preprocessor.transform(x)
+                return self._predict_transformed(x_transform, started, timings)
+
+            feature_names = getattr(self.preprocessor, "feature_names_in_", None)
+            if (
+                isinstance(x, pd.DataFrame)
+                and feature_names is not None
+                and not np.array_equal(x.columns, feature_names)
+            ):
+                x = x[feature_names]
+            x_transform = np.asarray(x)
+            if x_transform.dtype.kind in "biu":
+                ## integer matrices (e.g. .npy uploads) cannot hold NaN and are
+                ## handed to the model as they are, without a float copy
+                return self._predict_transformed(x_transform, started, timings)
+            x_transform = x_transform.astype(np.float64, copy=False)
+
+            ## only rows that actually contain NaNs go through the imputer
+            incomplete = np.isnan(x_transform).any(axis=1)
+            if incomplete.any():
+                x_transform = x_transform.copy()
+                rows = x.iloc[incomplete] if isinstance(x, pd.DataFrame) else x_transform[incomplete]
+                x_transform[incomplete] = self.preprocessor.transform(rows)
+            return self._predict_transformed(x_transform, started, timings)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
+
+    def _predict_transformed(
+        self, x_transform: object, started: float, timings: dict | None,
+    ) -> object:
+        transformed = time.perf_counter()
+        y_hat = self.model.predict(x_transform)
+        if timings is not None:
+            timings["preprocessor_transform"] = transformed - started
+            timings["model_predict"] = time.perf_counter() - transformed
+        return y_hat
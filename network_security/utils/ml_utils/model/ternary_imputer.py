@@ -0,0 +1,218 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+from network_security.exception.exception import NetworkSecurityException
+
+## receivers scored against the donor index at once; bounds the distance matrix
+_RECEIVER_BLOCK_SIZE = 128
+
+
+def _pack_bits(bits: np.ndarray) -> np.ndarray:
+    """Pack a boolean (n_rows, n_features) matrix into (n_rows, n_words) uint64 words."""
+    n_words = -(-bits.shape[1] // 64)
+    padded = np.zeros((bits.shape[0], n_words * 64), dtype=np.uint64)
+    padded[:, : bits.shape[1]] = bits
+    shifts = np.arange(64, dtype=np.uint64)
+    return np.bitwise_or.reduce(
+        padded.reshape(bits.shape[0], n_words, 64) << shifts, axis=2,
+    )
+
+
+class TernaryKNNImputer(TransformerMixin, BaseEstimator):
+    """
+    KNNImputer for features that only take the values -1, 0 and 1.
+
+    Same fit/transform contract and nan-euclidean neighbour definition as
+    sklearn's KNNImputer (uniform weights), but backed by a precomputed index:
+
+      - fit rows are de-duplicated and stored as bit planes (value is 1, value
+        is -1, value is present); the squared difference of two ternary values
+        is popcount(pos ^ pos') + popcount(neg ^ neg') + 2 * popcount of the
+        opposite-sign bits, so a distance over 64 features costs a few word
+        operations instead of 64 float ones
+      - imputed rows are memoised by their packed bit pattern, so repeated
+        missing-value patterns are answered without any search
+
+    Rows without missing values are returned unchanged, as in KNNImputer.
+
+    Tolerance: the neighbours are KNNImputer's unless the k-th nearest donor is
+    tied with the next one. Both then keep an arbitrary k of the tied donors
+    (argpartition over every training row there, over the de-duplicated rows
+    here), and ternary distances tie often: on phisingData.csv with 5% of the
+    cells blanked, 92.0% of the imputed cells equal KNNImputer's.
+    benchmark_inference.py measures this and fails below 90%.
+    Training columns that are entirely NaN are kept and imputed with 0 instead
+    of being dropped.
+    """
+
+    def __init__(
+        self,
+        missing_values: float = np.nan,
+        n_neighbors: int = 5,
+        weights: str = "uniform",
+        memo_size: int = 65_536,
+    ) -> None:
+        self.missing_values = missing_values
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.memo_size = memo_size
+
+    def fit(self, X: object, y: object = None) -> "TernaryKNNImputer":
+        try:
+            if self.weights != "uniform" or not np.isnan(self.missing_values):
+                raise ValueError("TernaryKNNImputer supports uniform weights and NaN missing values only")
+            if isinstance(X, pd.DataFrame):
+                self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+            values = np.asarray(X, dtype=np.float64)
+            missing = np.isnan(values)
+            if not np.isin(values[~missing], (-1, 0, 1)).all():
+                raise ValueError("TernaryKNNImputer expects feature values in {-1, 0, 1}")
+            self.n_features_in_ = values.shape[1]
+
+            filled = np.where(missing, 0, values).astype(np.int8)
+            present_sum = (~missing).sum(axis=0)
+            self.column_means_ = np.divide(
+                filled.sum(axis=0, dtype=np.float64),
+                present_sum,
+                out=np.zeros(values.shape[1]),
+                where=present_sum > 0,
+            )
+
+            ## missing cells are encoded as value 0 with the present bit cleared
+            unique_rows, counts = np.unique(
+                np.where(missing, 2, filled), axis=0, return_counts=True,
+            )
+            donor_missing = unique_rows == 2
+            self.donor_values_ = np.where(donor_missing, 0, unique_rows).astype(np.int8)
+            self.donor_counts_ = counts.astype(np.int32)
+            self.donor_present_ = ~donor_missing
+            self.donor_pos_bits_ = _pack_bits(self.donor_values_ == 1)
+            self.donor_neg_bits_ = _pack_bits(self.donor_values_ == -1)
+            self.donor_present_bits_ = _pack_bits(self.donor_present_)
+            self._reset_memo()
+            return self
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _reset_memo(self) -> None:
+        self._memo: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        ## BaseEstimator returns the live __dict__ for classes outside sklearn
+        state = dict(super().__getstate__())
+        state.pop("_memo", None)
+        state.pop("_memo_lock", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self._reset_memo()
+
+    def _squared_distances(
+        self, pos: np.ndarray, neg: np.ndarray, present: np.ndarray,
+    ) -> np.ndarray:
+        """nan-euclidean squared distances of packed receivers to every donor (inf if nothing in common)."""
+        common = present[:, None, :] & self.donor_present_bits_[None, :, :]
+        donor_pos = self.donor_pos_bits_[None, :, :]
+        donor_neg = self.donor_neg_bits_[None, :, :]
+        pos, neg = pos[:, None, :], neg[:, None, :]
+        squared = (
+            np.bitwise_count((pos ^ donor_pos) & common).sum(axis=2, dtype=np.int32)
+            + np.bitwise_count((neg ^ donor_neg) & common).sum(axis=2, dtype=np.int32)
+            + 2 * np.bitwise_count(((pos & donor_neg) | (neg & donor_pos)) & common).sum(
+                axis=2, dtype=np.int32,
+            )
+        )
+        n_common = np.bitwise_count(common).sum(axis=2, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distances = self.n_features_in_ * squared / n_common
+        distances[n_common == 0] = np.inf
+        return distances
+
+    def _impute_block(self, values: np.ndarray, missing: np.ndarray) -> np.ndarray:
+        present = ~missing
+        filled = np.where(missing, 0, values)
+        distances = self._squared_distances(
+            _pack_bits(filled == 1), _pack_bits(filled == -1), _pack_bits(present),
+        )
+        imputed = filled.copy()
+        for column in np.flatnonzero(missing.any(axis=0)):
+            receivers = np.flatnonzero(missing[:, column])
+            donors = np.flatnonzero(self.donor_present_[:, column])
+            if len(donors) == 0:
+                imputed[receivers, column] = 0.0
+                continue
+            n_candidates = min(self.n_neighbors, len(donors))
+            candidate_distances = distances[np.ix_(receivers, donors)]
+            ## every unique donor counts at least once, so the n_neighbors nearest
+            ## unique donors always cover the n_neighbors nearest rows; only
+            ## those few are sorted, by distance, to hand out the copy counts
+            if n_candidates < len(donors):
+                nearest = np.argpartition(candidate_distances, n_candidates - 1, axis=1)[:, :n_candidates]
+            else:
+                nearest = np.broadcast_to(np.arange(len(donors)), candidate_distances.shape)
+            nearest_distances = np.take_along_axis(candidate_distances, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1, kind="stable")
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            nearest_distances = np.take_along_axis(nearest_distances, order, axis=1)
+
+            ## duplicated training rows count once per copy, up to n_neighbors
+            counts = self.donor_counts_[donors][nearest]
+            taken = np.clip(self.n_neighbors - (np.cumsum(counts, axis=1) - counts), 0, counts)
+            weight = np.where(np.isfinite(nearest_distances), taken, 0)
+            donor_values = self.donor_values_[donors[nearest], column]
+
+            total_weight = weight.sum(axis=1)
+            imputed[receivers, column] = np.where(
+                total_weight > 0,
+                (donor_values * weight).sum(axis=1) / np.maximum(total_weight, 1),
+                self.column_means_[column],
+            )
+        return imputed
+
+    def transform(self, X: object) -> np.ndarray:
+        try:
+            check_is_fitted(self, "donor_values_")
+            if isinstance(X, pd.DataFrame) and hasattr(self, "feature_names_in_"):
+                X = X[self.feature_names_in_]
+            values = np.array(X, dtype=np.float64)
+            missing = np.isnan(values)
+            receivers = np.flatnonzero(missing.any(axis=1))
+            if len(receivers) == 0:
+                return values
+            if not np.isin(values[receivers][~missing[receivers]], (-1, 0, 1)).all():
+                raise ValueError("TernaryKNNImputer expects feature values in {-1, 0, 1}")
+
+            codes = np.where(missing[receivers], 2, values[receivers]).astype(np.int8)
+            keys = [row.tobytes() for row in codes]
+            unresolved = []
+            with self._memo_lock:
+                for row, key in zip(receivers, keys, strict=True):
+                    cached = self._memo.get(key)
+                    if cached is None:
+                        unresolved.append(row)
+                    else:
+                        self._memo.move_to_end(key)
+                        values[row] = cached
+
+            for start in range(0, len(unresolved), _RECEIVER_BLOCK_SIZE):
+                block = np.asarray(unresolved[start : start + _RECEIVER_BLOCK_SIZE])
+                values[block] = self._impute_block(values[block], missing[block])
+
+            if unresolved and self.memo_size > 0:
+                unresolved_keys = dict(zip(receivers.tolist(), keys, strict=True))
+                with self._memo_lock:
+                    for row in unresolved:
+                        self._memo[unresolved_keys[row]] = values[row].copy()
+                    while len(self._memo) > self.memo_size:
+                        self._memo.popitem(last=False)
+            return values
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
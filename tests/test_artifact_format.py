@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from network_security.constant.training_pipeline import SCHEMA_FILE_PATH
+from network_security.exception.exception import NetworkSecurityException
+from network_security.utils.main_utils.artifact_format import DataFrameWriter, read_dataframe
+from network_security.utils.main_utils.schema_types import SchemaTypes
+
+
+@pytest.fixture(scope="module")
+def schema_types() -> SchemaTypes:
+    return SchemaTypes(SCHEMA_FILE_PATH)
+
+
+def _chunks(schema_types: SchemaTypes) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    columns = list(schema_types.dtypes)
+    chunks = [
+        schema_types.enforce(
+            pd.DataFrame(rng.integers(-1, 2, size=(rows, len(columns))), columns=columns),
+        )
+        for rows in (40, 25, 10)
+    ]
+    ## the first column is int8 in one chunk and float32 with NaN in the next
+    chunks[1] = chunks[1].astype({columns[0]: np.float32})
+    chunks[1].iloc[3, 0] = np.nan
+    return chunks
+
+
+@pytest.mark.parametrize("artifact_format", ["csv", "parquet", "npz"])
+def test_chunked_write_reads_back_as_one_frame(
+    tmp_path: Path, schema_types: SchemaTypes, artifact_format: str,
+) -> None:
+    chunks = _chunks(schema_types)
+    file_path = tmp_path / f"train.{artifact_format}"
+
+    with DataFrameWriter(file_path, artifact_format, schema_types) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+
+    expected = schema_types.enforce(pd.concat(chunks, ignore_index=True))
+    read_back = read_dataframe(file_path, artifact_format, schema_types)
+    assert writer.rows == len(expected)
+    pd.testing.assert_frame_equal(read_back, expected)
+    assert list(tmp_path.iterdir()) == [file_path]
+
+
+def test_failed_chunked_write_publishes_nothing(tmp_path: Path, schema_types: SchemaTypes) -> None:
+    chunks = _chunks(schema_types)
+    file_path = tmp_path / "train.parquet"
+
+    with pytest.raises(NetworkSecurityException):
+        with DataFrameWriter(file_path, "parquet", schema_types) as writer:
+            writer.write(chunks[0])
+            writer.write(chunks[1].replace(1, 7))
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,130 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from bson import ObjectId
+
+from network_security.constant.prediction_pipeline import (
+    FINAL_MODEL_CURRENT_FILE_NAME,
+    FINAL_MODEL_DIR,
+    FINAL_MODEL_FILE_NAME,
+    FINAL_MODEL_VERSIONS_DIR,
+    FINAL_PREPROCESSOR_FILE_NAME,
+    PREDICTION_COLUMN_NAME,
+)
+from network_security.entity.config_entity import BatchPredictionConfig
+from network_security.pipeline.batch_prediction import (
+    BatchPrediction,
+    _read_csv_shard,
+    _read_mongo_shard,
+)
+from network_security.utils.main_utils.utils import read_yaml_file, write_version_marker
+
+DATA_FILE_PATH = "Network_Data/phisingData.csv"
+
+
+@pytest.fixture(scope="module")
+def rows() -> pd.DataFrame:
+    rows = pd.read_csv(DATA_FILE_PATH).head(300)
+    rows["URL_Length"] = rows["URL_Length"].mask(rows.index % 7 == 0)
+    return rows
+
+
+@pytest.fixture
+def input_file_path(tmp_path: object, rows: pd.DataFrame) -> object:
+    input_file_path = tmp_path / "input.csv"
+    rows.to_csv(input_file_path, index=False, na_rep="na")
+    return input_file_path
+
+
+def _publish(model_dir: object, version: str) -> None:
+    version_dir = model_dir / FINAL_MODEL_VERSIONS_DIR / version
+    version_dir.mkdir(parents=True)
+    for file_name in (FINAL_PREPROCESSOR_FILE_NAME, FINAL_MODEL_FILE_NAME):
+        shutil.copy(FINAL_MODEL_DIR / file_name, version_dir / file_name)
+    write_version_marker(model_dir / FINAL_MODEL_CURRENT_FILE_NAME, version)
+
+
+def _batch_prediction(
+    tmp_path: object, input_file_path: object = None, collection: object = None,
+) -> BatchPrediction:
+    config = BatchPredictionConfig(
+        input_file_path=input_file_path, output_dir=tmp_path / "output", num_workers=1,
+    )
+    config.shard_bytes = 4096
+    config.shard_rows = 64
+    config.preprocessor_file_path = tmp_path / "final_model" / FINAL_PREPROCESSOR_FILE_NAME
+    config.model_file_path = tmp_path / "final_model" / FINAL_MODEL_FILE_NAME
+    return BatchPrediction(config, collection=collection)
+
+
+def _expected(rows: pd.DataFrame) -> pd.DataFrame:
+    ## int8, and float32 for the column holding NaN
+    return rows.astype(dict.fromkeys(rows.columns, np.int8) | {"URL_Length": np.float32})
+
+
+def test_csv_shards_are_line_aligned_and_cover_the_file(
+    tmp_path: object, input_file_path: object, rows: pd.DataFrame,
+) -> None:
+    shards = _batch_prediction(tmp_path, input_file_path).plan_shards()
+
+    assert len(shards) > 2
+    assert shards[-1]["end"] == input_file_path.stat().st_size
+    assert all(shard["end"] == next_shard["start"] for shard, next_shard in zip(shards, shards[1:]))
+    df = pd.concat([_read_csv_shard(shard) for shard in shards], ignore_index=True)
+    pd.testing.assert_frame_equal(df, rows)
+
+
+def test_mongo_shards_are_read_into_compact_columns(tmp_path: object, rows: pd.DataFrame) -> None:
+    mongomock = pytest.importorskip("mongomock")
+    documents = rows.astype(object).where(rows.notna(), "na").to_dict("records")
+    for document in documents:
+        document["_id"] = ObjectId()
+    collection = mongomock.MongoClient().TEST_DB.NetworkData
+    collection.insert_many(documents)
+
+    shards = _batch_prediction(tmp_path, collection=collection).plan_shards()
+    partitions = [_read_mongo_shard(shard, collection) for shard in shards]
+
+    assert [len(partition) for partition in partitions] == [64, 64, 64, 64, 44]
+    df = pd.concat(partitions, ignore_index=True)
+    pd.testing.assert_frame_equal(df, _expected(rows))
+
+
+def test_rerun_resumes_and_a_new_model_starts_over(
+    tmp_path: object, input_file_path: object, rows: pd.DataFrame,
+) -> None:
+    model_dir = tmp_path / "final_model"
+    _publish(model_dir, "model-a")
+    batch_prediction = _batch_prediction(tmp_path, input_file_path)
+    manifest_file_path = batch_prediction.batch_prediction_config.manifest_file_path
+
+    first = batch_prediction.initiate_batch_prediction()
+    manifest = read_yaml_file(manifest_file_path)
+
+    assert first.scored_shard_count == first.shard_count > 2
+    assert first.total_rows == len(rows)
+    assert manifest["model_dir"] == str(model_dir / FINAL_MODEL_VERSIONS_DIR / "model-a")
+    output = pd.concat(
+        [pd.read_csv(file_path) for file_path in sorted((tmp_path / "output").glob("part-*.csv"))],
+        ignore_index=True,
+    )
+    assert output[PREDICTION_COLUMN_NAME].isin([0, 1]).all()
+    assert len(output) == len(rows)
+
+    ## a run that stopped after the first shard
+    manifest["completed"] = {0: manifest["completed"][0]}
+    batch_prediction.write_manifest(manifest)
+    resumed = batch_prediction.initiate_batch_prediction()
+
+    assert resumed.scored_shard_count == first.shard_count - 1
+    assert resumed.total_rows == len(rows)
+
+    ## same files, but published as another version: the run is not resumed
+    _publish(model_dir, "model-b")
+    rerun = batch_prediction.initiate_batch_prediction()
+
+    assert rerun.scored_shard_count == first.shard_count
+    manifest = read_yaml_file(manifest_file_path)
+    assert manifest["model_dir"] == str(model_dir / FINAL_MODEL_VERSIONS_DIR / "model-b")
@@ -0,0 +1,112 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from network_security.serving.batcher import MicroBatcher
+
+
+def _batcher(predict_fn: object, max_concurrent_batches: int = 1) -> MicroBatcher:
+    return MicroBatcher(
+        predict_fn=predict_fn,
+        feature_columns=["a"],
+        max_batch_size=8,
+        max_wait_seconds=0.01,
+        max_concurrent_batches=max_concurrent_batches,
+    )
+
+
+def test_failed_batch_is_rescored_row_by_row() -> None:
+    async def predict_fn(frame: pd.DataFrame) -> np.ndarray:
+        if (frame["a"] > 1).any():
+            raise ValueError("value outside the domain")
+        return frame["a"].to_numpy()
+
+    async def run() -> list:
+        batcher = _batcher(predict_fn)
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.submit({"a": value}) for value in (0.0, 1.0, 5.0)),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert results[:2] == [0.0, 1.0]
+    assert isinstance(results[2], ValueError)
+
+
+def test_scoring_concurrency_is_bounded() -> None:
+    running, peak = 0, 0
+
+    async def predict_fn(frame: pd.DataFrame) -> np.ndarray:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return frame["a"].to_numpy()
+
+    async def run() -> None:
+        batcher = _batcher(predict_fn, max_concurrent_batches=2)
+        await batcher.start()
+        for _ in range(5):
+            await asyncio.gather(*(batcher.submit({"a": 1.0}) for _ in range(20)))
+        await batcher.stop()
+
+    asyncio.run(run())
+
+    assert peak == 2
+
+
+def test_stop_cancels_scoring_and_waiting_callers() -> None:
+    async def predict_fn(frame: pd.DataFrame) -> np.ndarray:
+        await asyncio.sleep(60)
+        return frame["a"].to_numpy()
+
+    async def run() -> None:
+        batcher = _batcher(predict_fn)
+        await batcher.start()
+        callers = [asyncio.create_task(batcher.submit({"a": 1.0})) for _ in range(20)]
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        for caller in callers:
+            with pytest.raises(asyncio.CancelledError):
+                await caller
+        assert not batcher._score_tasks
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+
+@pytest.mark.parametrize("record", [{"foo": 1.0}, {"a": 1.0, "foo": 1.0}, {}])
+def test_records_must_hold_exactly_the_feature_columns(record: dict) -> None:
+    async def predict_fn(frame: pd.DataFrame) -> np.ndarray:
+        return frame["a"].to_numpy()
+
+    async def run() -> object:
+        batcher = _batcher(predict_fn)
+        try:
+            return await batcher.submit(record)
+        finally:
+            await batcher.stop()
+
+    with pytest.raises(ValueError, match="exactly the schema features"):
+        asyncio.run(run())
+
+
+def test_null_feature_is_a_missing_value() -> None:
+    async def predict_fn(frame: pd.DataFrame) -> np.ndarray:
+        return frame["a"].isna().to_numpy()
+
+    async def run() -> object:
+        batcher = _batcher(predict_fn)
+        try:
+            return await batcher.submit({"a": None})
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) is True
@@ -0,0 +1,141 @@
+import time
+from datetime import UTC, datetime
+
+import pandas as pd
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from network_security.cloud.bulk_load_registry import (
+    BULK_LOAD_COMPLETE,
+    BULK_LOAD_RUNNING,
+    document_id,
+    set_bulk_load_status,
+)
+from network_security.components.data_ingestion import DataIngestion
+from network_security.entity.config_entity import (
+    BulkLoadConfig,
+    DataIngestionConfig,
+    TrainingPipelineConfig,
+)
+from network_security.exception.exception import NetworkSecurityException
+from network_security.pipeline.bulk_load import BulkLoad
+from network_security.utils.main_utils.utils import read_yaml_file
+
+mongomock = pytest.importorskip("mongomock")
+
+DATA_FILE_PATH = "Network_Data/phisingData.csv"
+BATCH_SIZE = 50
+
+
+@pytest.fixture
+def input_file_path(tmp_path: object) -> object:
+    rows = pd.read_csv(DATA_FILE_PATH).head(230)
+    rows["URL_Length"] = rows["URL_Length"].mask(rows.index % 9 == 0)
+    input_file_path = tmp_path / "phisingData.csv"
+    rows.to_csv(input_file_path, index=False)
+    return input_file_path
+
+
+@pytest.fixture
+def collection() -> object:
+    return mongomock.MongoClient().TEST_DB.NetworkData
+
+
+def _bulk_load(tmp_path: object, input_file_path: object, collection: object) -> BulkLoad:
+    bulk_load_config = BulkLoadConfig(input_file_path=input_file_path, batch_size=BATCH_SIZE, num_writers=2)
+    bulk_load_config.manifest_file_path = tmp_path / "bulk_load" / "phisingData.yaml"
+    return BulkLoad(bulk_load_config, collection=collection)
+
+
+def _registry_status(collection: object) -> list[str]:
+    return [entry["status"] for entry in collection.database["bulk_loads"].find()]
+
+
+def test_load_inserts_every_row_once(tmp_path: object, input_file_path: object, collection: object) -> None:
+    bulk_load_artifact = _bulk_load(tmp_path, input_file_path, collection).initiate_bulk_load()
+
+    rows = pd.read_csv(input_file_path)
+    assert bulk_load_artifact.batch_count == bulk_load_artifact.loaded_batch_count == 5
+    assert bulk_load_artifact.total_rows == collection.count_documents({}) == len(rows)
+    load_id = read_yaml_file(tmp_path / "bulk_load" / "phisingData.yaml")["load_id"]
+    documents = list(collection.find().sort("_id", 1))
+    assert [document["_id"] for document in documents] == [document_id(load_id, row) for row in range(len(rows))]
+    ## missing cells are stored as null
+    assert [row for row, document in enumerate(documents) if document["URL_Length"] is None] == list(
+        range(0, len(rows), 9),
+    )
+    assert _registry_status(collection) == [BULK_LOAD_COMPLETE]
+
+
+def test_failed_load_resumes_without_doubling_rows(
+    tmp_path: object, input_file_path: object, collection: object,
+) -> None:
+    bulk_load = _bulk_load(tmp_path, input_file_path, collection)
+
+    def insert_half_of_batch_two(collection: object, documents: list[dict]) -> int:
+        if documents[0]["_id"] == document_id(load_id, 2 * BATCH_SIZE):
+            collection.insert_many(documents[: BATCH_SIZE // 2])
+            raise ConnectionError("connection lost")
+        return BulkLoad.insert_batch(collection, documents)
+
+    load_id = bulk_load.load_manifest(collection)["load_id"]
+    bulk_load.insert_batch = insert_half_of_batch_two
+    with pytest.raises(NetworkSecurityException):
+        bulk_load.initiate_bulk_load()
+
+    manifest = read_yaml_file(tmp_path / "bulk_load" / "phisingData.yaml")
+    assert manifest["load_id"] == load_id
+    assert 2 not in manifest["completed"]
+    assert _registry_status(collection) == [BULK_LOAD_RUNNING]
+
+    bulk_load_artifact = _bulk_load(tmp_path, input_file_path, collection).initiate_bulk_load()
+
+    assert bulk_load_artifact.loaded_batch_count == 5 - len(manifest["completed"])
+    assert bulk_load_artifact.total_rows == collection.count_documents({}) == 230
+    assert len(collection.distinct("_id")) == 230
+    assert _registry_status(collection) == [BULK_LOAD_COMPLETE]
+
+
+def test_rows_already_present_count_as_loaded(collection: object) -> None:
+    documents = [{"_id": document_id(1, row), "URL_Length": 1} for row in range(10)]
+    collection.insert_many(documents[:4])
+
+    assert BulkLoad.insert_batch(collection, documents) == 10
+    assert collection.count_documents({}) == 10
+
+
+def test_other_write_errors_are_raised() -> None:
+    class RejectingCollection:
+        def insert_many(self, documents: list[dict], ordered: bool) -> None:
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": 121, "errmsg": "validation failed"}]})
+
+    with pytest.raises(BulkWriteError):
+        BulkLoad.insert_batch(RejectingCollection(), [{"URL_Length": 1}])
+
+
+def test_ingestion_watermark_stays_below_a_running_load(collection: object) -> None:
+    load_id = int(time.time()) - 60
+    before_load = ObjectId.from_datetime(datetime.fromtimestamp(load_id - 60, UTC))
+    during_load = ObjectId()
+    collection.insert_many(
+        [
+            {"_id": before_load, "URL_Length": 1},
+            {"_id": document_id(load_id, 0), "URL_Length": -1},
+            {"_id": during_load, "URL_Length": 0},
+        ],
+    )
+    set_bulk_load_status(collection, load_id, BULK_LOAD_RUNNING)
+    data_ingestion = DataIngestion(DataIngestionConfig(TrainingPipelineConfig()), collection=collection)
+    manifest = {"watermark_key": "_id", "watermark": None}
+
+    query, watermark = data_ingestion.delta_query(manifest)
+
+    assert watermark == before_load
+    assert query == {"_id": {"$lte": before_load}}
+
+    set_bulk_load_status(collection, load_id, BULK_LOAD_COMPLETE)
+    _, watermark = data_ingestion.delta_query(manifest)
+
+    ## once the load is complete the watermark passes its ids
+    assert watermark == during_load
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import AdaBoostClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from network_security.utils.ml_utils.model.compiled_ensemble import BatchSizeRouter, CompiledTreeEnsemble
+
+
+@pytest.fixture(scope="module")
+def ternary_data() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Phishing-like ternary features, a noisy label in {-1, 1} and a held-out set."""
+    rng = np.random.default_rng(0)
+    x = rng.integers(-1, 2, size=(600, 12)).astype(np.float64)
+    score = x[:, 0] + 0.5 * x[:, 3] - x[:, 7] + rng.normal(scale=0.8, size=len(x))
+    y = np.where(score > 0, 1, -1)
+    return x[:400], y[:400], x[400:]
+
+
+@pytest.mark.parametrize(
+    "estimator",
+    [
+        DecisionTreeClassifier(max_depth=6, random_state=0),
+        RandomForestClassifier(n_estimators=25, max_depth=5, random_state=0),
+        AdaBoostClassifier(n_estimators=25, random_state=0),
+        GradientBoostingClassifier(n_estimators=25, max_depth=3, random_state=0),
+    ],
+    ids=lambda estimator: type(estimator).__name__,
+)
+def test_compiled_predictions_match_sklearn(
+    estimator: object, ternary_data: tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> None:
+    x_train, y_train, x_test = ternary_data
+    estimator.fit(x_train, y_train)
+
+    compiled = CompiledTreeEnsemble.from_estimator(estimator)
+
+    np.testing.assert_array_equal(compiled.predict(x_test), estimator.predict(x_test))
+    np.testing.assert_array_equal(compiled.predict(x_train), estimator.predict(x_train))
+
+
+def test_gradient_boosting_init_probe_recovers_the_raw_score(
+    ternary_data: tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> None:
+    x_train, y_train, x_test = ternary_data
+    ## an unbalanced label makes the prior (and so the init term) clearly non-zero
+    y_unbalanced = np.where(x_train[:, 0] > -1, 1, -1)
+    estimator = GradientBoostingClassifier(n_estimators=10, random_state=0).fit(x_train, y_unbalanced)
+
+    compiled = CompiledTreeEnsemble.from_estimator(estimator)
+
+    assert abs(compiled.init[0]) > 0.1
+    np.testing.assert_allclose(compiled._raw(x_test)[:, 0], estimator.decision_function(x_test), atol=1e-9)
+
+
+def test_unsupported_estimators_are_rejected() -> None:
+    x = np.array([[0.0], [1.0], [2.0]])
+    estimator = GradientBoostingClassifier(n_estimators=2).fit(x, [0, 1, 2])
+
+    with pytest.raises(ValueError, match="binary GradientBoosting"):
+        CompiledTreeEnsemble.from_estimator(estimator)
+
+
+def test_router_sends_large_batches_to_sklearn(
+    ternary_data: tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> None:
+    x_train, y_train, x_test = ternary_data
+    estimator = RandomForestClassifier(n_estimators=10, random_state=0).fit(x_train, y_train)
+    compiled = CompiledTreeEnsemble.from_estimator(estimator)
+    calls = []
+    compiled.predict = lambda x, predict=compiled.predict: calls.append(len(x)) or predict(x)
+    router = BatchSizeRouter(compiled, estimator, max_compiled_rows=64)
+
+    np.testing.assert_array_equal(router.predict(x_test[:64]), estimator.predict(x_test[:64]))
+    np.testing.assert_array_equal(router.predict(x_test), estimator.predict(x_test))
+    assert calls == [64]
@@ -0,0 +1,308 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from network_security.components.data_ingestion import DataIngestion
+from network_security.entity.config_entity import DataIngestionConfig, TrainingPipelineConfig
+from network_security.exception.exception import NetworkSecurityException
+from network_security.utils.main_utils.utils import read_yaml_file
+
+mongomock = pytest.importorskip("mongomock")
+
+DATA_FILE_PATH = "Network_Data/phisingData.csv"
+
+
+class RecordingCollection:
+    """
+    mongomock collection that records find() calls and answers $bucketAuto.
+
+    mongomock does not implement $bucketAuto; the buckets are computed here
+    the way mongodb does for distinct keys: sorted, cut into equal counts.
+    """
+
+    def __init__(self, collection: object) -> None:
+        self._collection = collection
+        self.finds = []
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._collection, name)
+
+    def find(self, *args: object, **kwargs: object) -> object:
+        self.finds.append((args, kwargs))
+        return self._collection.find(*args, **kwargs)
+
+    def aggregate(self, pipeline: list[dict], **kwargs: object) -> list[dict]:
+        match, bucket_auto = pipeline[0]["$match"], pipeline[1]["$bucketAuto"]
+        key = bucket_auto["groupBy"].removeprefix("$")
+        values = sorted(document[key] for document in self._collection.find(match, {key: 1}))
+        chunks = [chunk.tolist() for chunk in np.array_split(values, bucket_auto["buckets"]) if len(chunk)]
+        return [
+            {
+                "_id": {"min": chunk[0], "max": chunks[index + 1][0] if index + 1 < len(chunks) else chunk[-1]},
+                "count": len(chunk),
+            }
+            for index, chunk in enumerate(chunks)
+        ]
+
+
+@pytest.fixture(scope="module")
+def rows() -> pd.DataFrame:
+    return pd.read_csv(DATA_FILE_PATH).head(200)
+
+
+def _documents(rows: pd.DataFrame, first_id: int = 0) -> list[dict]:
+    documents = rows.astype(object).to_dict("records")
+    for row, document in enumerate(documents, start=first_id):
+        document["_id"] = row
+    return documents
+
+
+@pytest.fixture
+def collection(rows: pd.DataFrame) -> RecordingCollection:
+    collection = mongomock.MongoClient().TEST_DB.NetworkData
+    collection.insert_many(_documents(rows))
+    return RecordingCollection(collection)
+
+
+def _data_ingestion(tmp_path: object, collection: object, **config: object) -> DataIngestion:
+    data_ingestion_config = DataIngestionConfig(TrainingPipelineConfig())
+    data_ingestion_config.feature_store_dir = tmp_path / "feature_store"
+    data_ingestion_config.feature_store_manifest_file_path = tmp_path / "feature_store" / "manifest.yaml"
+    data_ingestion_config.training_file_path = tmp_path / "ingested" / "train.csv"
+    data_ingestion_config.testing_file_path = tmp_path / "ingested" / "test.csv"
+    data_ingestion_config.artifact_format = "csv"
+    for name, value in config.items():
+        setattr(data_ingestion_config, name, value)
+    return DataIngestion(data_ingestion_config, collection=collection)
+
+
+def test_na_becomes_nan_in_a_float32_column(tmp_path: object, rows: pd.DataFrame) -> None:
+    documents = _documents(rows)
+    for document in documents[::7]:
+        document["URL_Length"] = "na"
+    collection = mongomock.MongoClient().TEST_DB.NetworkData
+    collection.insert_many(documents)
+    data_ingestion = _data_ingestion(tmp_path, collection, read_parallelism=1)
+
+    df = pd.concat(data_ingestion.iter_collection_partitions(), ignore_index=True)
+
+    assert df["URL_Length"].dtype == np.float32
+    assert df["URL_Length"].isna().to_numpy().nonzero()[0].tolist() == list(range(0, len(rows), 7))
+    expected = rows["URL_Length"].astype(np.float32).mask(df["URL_Length"].isna())
+    pd.testing.assert_series_equal(df["URL_Length"], expected)
+    assert (df.drop(columns=["URL_Length"]).dtypes == np.int8).all()
+    pd.testing.assert_frame_equal(
+        df.drop(columns=["URL_Length"]), rows.drop(columns=["URL_Length"]).astype(np.int8),
+    )
+
+
+@pytest.mark.parametrize("read_parallelism", [1, 2])
+def test_id_is_projected_out_on_the_server(
+    tmp_path: object, collection: RecordingCollection, rows: pd.DataFrame, read_parallelism: int,
+) -> None:
+    data_ingestion = _data_ingestion(tmp_path, collection, read_parallelism=read_parallelism)
+
+    df = pd.concat(data_ingestion.iter_collection_partitions(), ignore_index=True)
+
+    assert collection.finds
+    assert all(args[1] == {"_id": 0} for args, _ in collection.finds)
+    assert list(df.columns) == list(rows.columns)
+    assert (df.dtypes == np.int8).all()
+
+
+def test_sequential_read_yields_partitions_of_partition_rows(
+    tmp_path: object, collection: RecordingCollection, rows: pd.DataFrame,
+) -> None:
+    data_ingestion = _data_ingestion(
+        tmp_path, collection, read_parallelism=1, partition_rows=64, cursor_batch_size=16,
+    )
+
+    partitions = list(data_ingestion.iter_collection_partitions())
+
+    assert [len(partition) for partition in partitions] == [64, 64, 64, 8]
+    assert all(kwargs["batch_size"] == 16 for _, kwargs in collection.finds)
+    pd.testing.assert_frame_equal(pd.concat(partitions, ignore_index=True), rows.astype(np.int8))
+
+
+def test_parallel_read_plans_one_range_per_partition_rows(
+    tmp_path: object, collection: RecordingCollection, rows: pd.DataFrame,
+) -> None:
+    data_ingestion = _data_ingestion(
+        tmp_path, collection, read_parallelism=2, partition_rows=64, cursor_batch_size=16,
+    )
+
+    partitions = list(data_ingestion.iter_collection_partitions())
+
+    ## ceil(200 / 64) ranges, more than read_parallelism
+    assert [len(partition) for partition in partitions] == [50, 50, 50, 50]
+    assert len(collection.finds) == 4
+    pd.testing.assert_frame_equal(pd.concat(partitions, ignore_index=True), rows.astype(np.int8))
+
+
+def test_query_limits_the_read(tmp_path: object, collection: RecordingCollection, rows: pd.DataFrame) -> None:
+    data_ingestion = _data_ingestion(tmp_path, collection, read_parallelism=2, partition_rows=64)
+
+    df = pd.concat(data_ingestion.iter_collection_partitions({"_id": {"$gte": 150}}), ignore_index=True)
+
+    pd.testing.assert_frame_equal(df, rows.iloc[150:].reset_index(drop=True).astype(np.int8))
+
+
+@pytest.fixture
+def sparse_collection(rows: pd.DataFrame) -> RecordingCollection:
+    ## even _ids only, so documents can be inserted into a planned range later
+    documents = _documents(rows)
+    for document in documents:
+        document["_id"] *= 2
+    collection = mongomock.MongoClient().TEST_DB.NetworkData
+    collection.insert_many(documents)
+    return RecordingCollection(collection)
+
+
+def _read_back(collection: object, query: dict, columns: list[str]) -> pd.DataFrame:
+    return pd.DataFrame(list(collection.find(query, {"_id": 0})), columns=columns).astype(np.int8)
+
+
+@pytest.mark.parametrize("query", [{}, {"_id": {"$gte": 100}}])
+def test_planned_ranges_cover_every_document_once(
+    tmp_path: object, sparse_collection: RecordingCollection, query: dict,
+) -> None:
+    data_ingestion = _data_ingestion(tmp_path, sparse_collection)
+
+    partitions = data_ingestion.plan_partitions(sparse_collection, query, buckets=4)
+
+    assert len(partitions) == 4
+    assert [sparse_collection.count_documents(partition["filter"]) for partition in partitions] == [
+        partition["count"] for partition in partitions
+    ]
+    ids = [
+        document["_id"]
+        for partition in partitions
+        for document in sparse_collection.find(partition["filter"], {"_id": 1})
+    ]
+    assert ids == [document["_id"] for document in sparse_collection.find(query, {"_id": 1})]
+
+
+@pytest.mark.parametrize(("deleted", "inserted"), [(0, 3), (5, 0), (2, 5)])
+def test_range_reads_the_documents_present_at_read_time(
+    tmp_path: object, sparse_collection: RecordingCollection, rows: pd.DataFrame, deleted: int, inserted: int,
+) -> None:
+    data_ingestion = _data_ingestion(tmp_path, sparse_collection, cursor_batch_size=16)
+    partition = data_ingestion.plan_partitions(sparse_collection, {}, buckets=4)[0]
+    ## documents written between the plan and the read: fewer or more than counted
+    sparse_collection.delete_many({"_id": {"$in": [2, 10, 20, 30, 40][:deleted]}})
+    new_documents = _documents(rows.tail(inserted))
+    for document in new_documents:
+        document["_id"] = document["_id"] * 2 + 1
+    if new_documents:
+        sparse_collection.insert_many(new_documents)
+
+    df = data_ingestion._read_partition(sparse_collection, list(rows.columns), partition)
+
+    assert len(df) == partition["count"] - deleted + inserted
+    pd.testing.assert_frame_equal(df, _read_back(sparse_collection, partition["filter"], list(rows.columns)))
+
+
+def _feature_store_rows(data_ingestion: DataIngestion) -> pd.DataFrame:
+    manifest = data_ingestion.load_feature_store_manifest()
+    return pd.concat(data_ingestion.iter_feature_store(manifest), ignore_index=True)
+
+
+def _split_rows(data_ingestion: DataIngestion) -> int:
+    config = data_ingestion.data_ingestion_config
+    return len(pd.read_csv(config.training_file_path)) + len(pd.read_csv(config.testing_file_path))
+
+
+@pytest.fixture(scope="module")
+def new_rows() -> pd.DataFrame:
+    return pd.read_csv(DATA_FILE_PATH).iloc[200:250].reset_index(drop=True)
+
+
+def test_incremental_run_exports_only_documents_above_the_watermark(
+    tmp_path: object, collection: RecordingCollection, rows: pd.DataFrame, new_rows: pd.DataFrame,
+) -> None:
+    data_ingestion = _data_ingestion(tmp_path, collection, read_parallelism=1)
+    data_ingestion.initiate_data_ingestion()
+    first_manifest = data_ingestion.load_feature_store_manifest()
+    collection.insert_many(_documents(new_rows, first_id=len(rows)))
+    collection.finds.clear()
+
+    data_ingestion.initiate_data_ingestion()
+    manifest = data_ingestion.load_feature_store_manifest()
+
+    assert first_manifest["watermark"] == len(rows) - 1
+    assert manifest["watermark"] == len(rows) + len(new_rows) - 1
+    assert manifest["snapshot"] == first_manifest["snapshot"]
+    assert manifest["partitions"][:1] == first_manifest["partitions"]
+    assert [partition["rows"] for partition in manifest["partitions"]] == [len(rows), len(new_rows)]
+    delta = {"_id": {"$gt": first_manifest["watermark"], "$lte": manifest["watermark"]}}
+    assert [args[0] for args, _ in collection.finds] == [delta]
+    expected = pd.concat([rows, new_rows], ignore_index=True).astype(np.int8)
+    pd.testing.assert_frame_equal(_feature_store_rows(data_ingestion), expected)
+    assert _split_rows(data_ingestion) == len(expected)
+
+    data_ingestion.initiate_data_ingestion()
+
+    assert data_ingestion.load_feature_store_manifest() == manifest
+    assert _split_rows(data_ingestion) == len(expected)
+
+
+def test_failed_export_is_redone_by_the_next_run(
+    tmp_path: object, collection: RecordingCollection, rows: pd.DataFrame, new_rows: pd.DataFrame,
+) -> None:
+    data_ingestion = _data_ingestion(tmp_path, collection, read_parallelism=1, partition_rows=16)
+    data_ingestion.initiate_data_ingestion()
+    manifest = data_ingestion.load_feature_store_manifest()
+    collection.insert_many(_documents(new_rows, first_id=len(rows)))
+
+    def crash_after_one_partition(query: dict | None = None) -> object:
+        partitions = DataIngestion.iter_collection_partitions(data_ingestion, query)
+        yield next(partitions)
+        raise ConnectionError("connection lost")
+
+    data_ingestion.iter_collection_partitions = crash_after_one_partition
+    with pytest.raises(NetworkSecurityException):
+        data_ingestion.initiate_data_ingestion()
+
+    ## the written partition is not in the manifest, so it is never read
+    assert data_ingestion.load_feature_store_manifest() == manifest
+    assert (data_ingestion._snapshot_dir(manifest) / f"part-{len(manifest['partitions']):05d}.csv").exists()
+
+    data_ingestion = _data_ingestion(tmp_path, collection, read_parallelism=1, partition_rows=16)
+    data_ingestion.initiate_data_ingestion()
+
+    expected = pd.concat([rows, new_rows], ignore_index=True).astype(np.int8)
+    pd.testing.assert_frame_equal(_feature_store_rows(data_ingestion), expected)
+    assert _split_rows(data_ingestion) == len(expected)
+
+
+def test_full_export_replaces_the_snapshot_once_its_manifest_is_written(
+    tmp_path: object, collection: RecordingCollection, rows: pd.DataFrame,
+) -> None:
+    data_ingestion = _data_ingestion(tmp_path, collection, read_parallelism=1, incremental=False)
+    snapshots = []
+    for _ in range(3):
+        data_ingestion.initiate_data_ingestion()
+        snapshots.append(read_yaml_file(data_ingestion.data_ingestion_config.feature_store_manifest_file_path))
+    feature_store_dir = data_ingestion.data_ingestion_config.feature_store_dir
+
+    ## a run that loaded the previous manifest can still read its snapshot
+    assert sorted(path.name for path in feature_store_dir.glob("snapshot-*")) == sorted(
+        manifest["snapshot"] for manifest in snapshots[1:]
+    )
+    previous = pd.concat(data_ingestion.iter_feature_store(snapshots[1]), ignore_index=True)
+    pd.testing.assert_frame_equal(previous, rows.astype(np.int8))
+
+    data_ingestion.iter_collection_partitions = lambda query=None: iter([rows.head(0), rows, None])
+    with pytest.raises(NetworkSecurityException):
+        data_ingestion.initiate_data_ingestion()
+
+    assert read_yaml_file(data_ingestion.data_ingestion_config.feature_store_manifest_file_path) == snapshots[-1]
+    current = pd.concat(data_ingestion.iter_feature_store(snapshots[-1]), ignore_index=True)
+    pd.testing.assert_frame_equal(current, rows.astype(np.int8))
+
+
+def test_empty_collection_reports_an_empty_feature_store(tmp_path: object) -> None:
+    data_ingestion = _data_ingestion(tmp_path, mongomock.MongoClient().TEST_DB.NetworkData)
+
+    with pytest.raises(NetworkSecurityException, match="The feature store is empty"):
+        data_ingestion.initiate_data_ingestion()
@@ -0,0 +1,34 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from network_security.serving.executor import InferenceExecutor
+from network_security.serving.prediction_cache import PredictionCache
+
+
+def test_concurrent_start_creates_one_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    executor = InferenceExecutor(
+        name="test",
+        kind="thread",
+        max_workers=1,
+        model_holder=None,
+        prediction_cache=PredictionCache(max_entries=0),
+    )
+    created = []
+
+    def slow_create_pool() -> ThreadPoolExecutor:
+        time.sleep(0.05)
+        created.append(ThreadPoolExecutor(max_workers=1))
+        return created[-1]
+
+    monkeypatch.setattr(executor, "_create_pool", slow_create_pool)
+    starters = [threading.Thread(target=executor.start) for _ in range(8)]
+    for starter in starters:
+        starter.start()
+    for starter in starters:
+        starter.join()
+
+    assert len(created) == 1
+    executor.shutdown()
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from network_security.utils.main_utils.hash_split import hash_split
+
+HASH_KEY = "network-security"
+
+
+@pytest.fixture(scope="module")
+def dataframe() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    ## few distinct rows, so most rows have duplicates
+    frame = pd.DataFrame(rng.integers(-1, 2, size=(4000, 4)), columns=list("abcd"))
+    frame["label"] = np.where(rng.random(len(frame)) < 0.3, 1, -1)
+    return frame.astype(np.int8)
+
+
+def _shared_rows(train: pd.DataFrame, test: pd.DataFrame) -> int:
+    return len(pd.merge(train.drop_duplicates(), test.drop_duplicates(), how="inner"))
+
+
+@pytest.mark.parametrize("stratify_column", [None, "label"])
+def test_split_is_deterministic(dataframe: pd.DataFrame, stratify_column: str | None) -> None:
+    first = hash_split(dataframe, 0.2, HASH_KEY, stratify_column=stratify_column)
+    again = hash_split(dataframe.astype(np.float32), 0.2, HASH_KEY, stratify_column=stratify_column)
+
+    for split, split_again in zip(first, again, strict=True):
+        np.testing.assert_array_equal(split.index, split_again.index)
+
+
+def test_unstratified_rows_keep_their_side_across_chunks(dataframe: pd.DataFrame) -> None:
+    train, test = hash_split(dataframe, 0.2, HASH_KEY)
+    chunks = [
+        hash_split(dataframe.iloc[start : start + 600], 0.2, HASH_KEY)
+        for start in range(0, len(dataframe), 600)
+    ]
+
+    np.testing.assert_array_equal(pd.concat([chunk[1] for chunk in chunks]).index, test.index)
+    np.testing.assert_array_equal(pd.concat([chunk[0] for chunk in chunks]).index, train.index)
+
+
+def test_stratified_split_keeps_the_class_ratio(dataframe: pd.DataFrame) -> None:
+    train, test = hash_split(dataframe, 0.2, HASH_KEY, stratify_column="label")
+
+    assert len(train) + len(test) == len(dataframe)
+    for label, rows in dataframe["label"].value_counts().items():
+        test_rows = (test["label"] == label).sum()
+        ## ties at the cutoff may only move test rows to train
+        assert round(0.2 * rows) - rows * 0.05 <= test_rows <= round(0.2 * rows)
+
+
+@pytest.mark.parametrize("stratify_column", [None, "label"])
+def test_duplicate_rows_stay_on_one_side(dataframe: pd.DataFrame, stratify_column: str | None) -> None:
+    train, test = hash_split(dataframe, 0.2, HASH_KEY, stratify_column=stratify_column)
+
+    assert dataframe.duplicated().sum() > len(dataframe) / 2
+    assert _shared_rows(train, test) == 0
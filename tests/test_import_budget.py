@@ -0,0 +1,39 @@
+## `import app` must be fast and must not touch the network or external services
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_TIME_BUDGET_SECONDS = 3.0
+
+## runs in a fresh interpreter: any connection attempt during import fails loudly
+IMPORT_PROBE = """
+import socket
+import sys
+import time
+
+def _refuse(*args, **kwargs):
+    raise RuntimeError(f"network access during import: {args}")
+
+socket.socket.connect = _refuse
+socket.create_connection = _refuse
+socket.getaddrinfo = _refuse
+
+started = time.perf_counter()
+__import__(sys.argv[1])
+print(time.perf_counter() - started)
+"""
+
+
+@pytest.mark.parametrize("module_name", ["app", "network_security.pipeline.training_pipeline"])
+def test_import_is_offline_and_within_budget(module_name: str) -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE, module_name],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    seconds = float(result.stdout.strip().splitlines()[-1])
+    assert seconds <= IMPORT_TIME_BUDGET_SECONDS
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.impute import SimpleImputer
+from sklearn.tree import DecisionTreeClassifier
+
+from network_security.components.model_trainer import ModelTrainer
+from network_security.constant.prediction_pipeline import (
+    FINAL_MODEL_CURRENT_FILE_NAME,
+    FINAL_MODEL_DIR,
+    FINAL_MODEL_FILE_NAME,
+    FINAL_MODEL_VERSIONS_DIR,
+    FINAL_PREPROCESSOR_FILE_NAME,
+)
+from network_security.serving.model_holder import ModelHolder
+
+
+def _fit(seed: int) -> tuple[SimpleImputer, DecisionTreeClassifier]:
+    rng = np.random.default_rng(seed)
+    x = rng.integers(-1, 2, size=(200, 4)).astype(np.float64)
+    y = (x[:, seed % 4] > 0).astype(int)
+    return SimpleImputer().fit(x), DecisionTreeClassifier(random_state=0).fit(x, y)
+
+
+@pytest.fixture
+def model_holder(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ModelHolder:
+    monkeypatch.chdir(tmp_path)
+    return ModelHolder(
+        preprocessor_file_path=FINAL_MODEL_DIR / FINAL_PREPROCESSOR_FILE_NAME,
+        model_file_path=FINAL_MODEL_DIR / FINAL_MODEL_FILE_NAME,
+        poll_interval=0,
+        use_compiled_model=True,
+    )
+
+
+def test_reloads_only_when_the_current_marker_switches(model_holder: ModelHolder) -> None:
+    model_trainer = ModelTrainer(model_trainer_config=None, data_transformation_artifact=None)
+    first = model_trainer.push_model(*_fit(0))
+    model_holder.load()
+    first_model_version = model_holder.version
+
+    ## files of a push that has not switched the marker yet are not picked up
+    second = model_trainer.push_model(*_fit(1))
+    current_file_path = FINAL_MODEL_DIR / FINAL_MODEL_CURRENT_FILE_NAME
+    current_file_path.write_text(f"{first}\n")
+    assert not model_holder.refresh()
+    assert model_holder.version == first_model_version
+
+    current_file_path.write_text(f"{second}\n")
+    assert model_holder.refresh()
+    assert model_holder.version != first_model_version
+    assert not model_holder.refresh()
+
+
+def test_push_keeps_the_new_and_the_replaced_version(model_holder: ModelHolder) -> None:
+    model_trainer = ModelTrainer(model_trainer_config=None, data_transformation_artifact=None)
+    versions = [model_trainer.push_model(*_fit(seed)) for seed in range(3)]
+
+    versions_dir = FINAL_MODEL_DIR / FINAL_MODEL_VERSIONS_DIR
+    assert sorted(path.name for path in versions_dir.iterdir()) == sorted(versions[1:])
+    model_holder.load()
+    assert model_holder.version == model_holder.peek_version()
@@ -0,0 +1,27 @@
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from network_security.serving.output_store import PredictionOutputStore
+
+
+def test_retention_evicts_pairs_and_sweeps_orphaned_summaries(tmp_path: Path) -> None:
+    store = PredictionOutputStore(output_dir=tmp_path, max_files=2, max_bytes=10**9, ttl_seconds=3600)
+    output_ids = [store.new_output_id() for _ in range(3)]
+    for age, output_id in zip((30, 20, 10), output_ids, strict=True):
+        store.write(output_id, pd.DataFrame({"a": [1, 2]}), {"rows": 2})
+        for suffix in (".csv", ".yaml"):
+            mtime = time.time() - age
+            os.utime(tmp_path / f"{output_id}{suffix}", (mtime, mtime))
+    orphan_id = store.new_output_id()
+    (tmp_path / f"{orphan_id}.yaml").write_text("rows: 2\n")
+
+    store.enforce_retention()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f"{output_id}{suffix}" for output_id in output_ids[1:] for suffix in (".csv", ".yaml")
+    )
+    assert store.read_summary(output_ids[0]) is None
+    assert store.read_summary(output_ids[2]) == {"rows": 2}
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from sklearn.impute import KNNImputer
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeClassifier
+
+from network_security.serving.prediction_cache import PredictionCache, encode_feature_rows
+from network_security.utils.ml_utils.model.estimator import NetworkModel
+
+
+def _network_model(x: pd.DataFrame, y: np.ndarray) -> NetworkModel:
+    preprocessor = Pipeline([("imputer", KNNImputer(n_neighbors=3))]).fit(x)
+    model = DecisionTreeClassifier(random_state=0).fit(preprocessor.transform(x), y)
+    return NetworkModel(preprocessor=preprocessor, model=model)
+
+
+def test_permuted_and_extra_columns_hit_the_same_entries() -> None:
+    rng = np.random.default_rng(0)
+    x = pd.DataFrame(rng.integers(-1, 2, size=(200, 5)), columns=list("abcde"))
+    y = (x["a"] + x["c"] > 0).astype(int).to_numpy()
+    network_model = _network_model(x, y)
+    cache = PredictionCache(max_entries=1000)
+
+    expected = cache.predict(network_model, x)
+    permuted = x[list("ecbda")].assign(url="http://example.com")
+    y_hat = cache.predict(network_model, permuted)
+
+    np.testing.assert_array_equal(y_hat, expected)
+    np.testing.assert_array_equal(y_hat, network_model.predict(x))
+    stats = cache.stats()
+    assert stats["hits"] == len(x)
+    assert stats["misses"] == len(x)
+
+
+def test_int8_and_float_rows_share_keys() -> None:
+    values = np.array([[-1, 0, 1], [1, 1, -1], [0, 5, 0]], dtype=np.int8)
+
+    int_keys, int_cacheable = encode_feature_rows(values)
+    float_keys, float_cacheable = encode_feature_rows(values.astype(np.float64))
+
+    np.testing.assert_array_equal(int_cacheable, [True, True, False])
+    np.testing.assert_array_equal(int_cacheable, float_cacheable)
+    np.testing.assert_array_equal(int_keys[int_cacheable], float_keys[float_cacheable])
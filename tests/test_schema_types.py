@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from network_security.constant.training_pipeline import SCHEMA_FILE_PATH
+from network_security.exception.exception import NetworkSecurityException
+from network_security.utils.main_utils.schema_types import SchemaTypes
+
+
+@pytest.fixture(scope="module")
+def schema_types() -> SchemaTypes:
+    return SchemaTypes(SCHEMA_FILE_PATH)
+
+
+def _raw_frame(schema_types: SchemaTypes, rows: int = 50) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    columns = list(schema_types.dtypes)
+    return pd.DataFrame(rng.integers(-1, 2, size=(rows, len(columns))), columns=columns)
+
+
+def test_enforce_types_to_int8_and_float32_with_missing(schema_types: SchemaTypes) -> None:
+    raw = _raw_frame(schema_types).astype(object)
+    raw.iloc[0, 0] = "na"
+
+    typed = schema_types.enforce(raw)
+
+    assert typed.dtypes.iloc[0] == np.float32
+    assert (typed.dtypes.iloc[1:] == np.int8).all()
+    assert np.isnan(typed.iloc[0, 0])
+
+
+def test_enforce_returns_an_already_typed_frame_without_copying(schema_types: SchemaTypes) -> None:
+    typed = schema_types.enforce(_raw_frame(schema_types))
+
+    assert schema_types.enforce(typed) is typed
+
+
+def test_enforce_rejects_values_outside_the_domain(schema_types: SchemaTypes) -> None:
+    raw = _raw_frame(schema_types)
+    raw.iloc[3, 2] = 7
+
+    with pytest.raises(NetworkSecurityException, match="Values outside"):
+        schema_types.enforce(raw)
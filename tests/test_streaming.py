@@ -0,0 +1,33 @@
+import asyncio
+import io
+
+import numpy as np
+import pandas as pd
+
+from network_security.constant.prediction_pipeline import PREDICTION_COLUMN_NAME
+from network_security.constant.training_pipeline import SCHEMA_FILE_PATH
+from network_security.serving.streaming import stream_predictions
+from network_security.utils.main_utils.schema_types import SchemaTypes
+
+
+def test_chunks_are_typed_and_scored_through_predict_fn() -> None:
+    schema_types = SchemaTypes(SCHEMA_FILE_PATH)
+    columns = list(schema_types.dtypes)[:3]
+    upload = pd.DataFrame({column: [-1, 0, 1, 1, "na"] for column in columns})
+    scored_chunks = []
+
+    async def predict_fn(chunk: pd.DataFrame) -> np.ndarray:
+        scored_chunks.append(chunk.dtypes.tolist())
+        return np.ones(len(chunk), dtype=np.int8)
+
+    async def consume() -> bytes:
+        source = io.BytesIO(upload.to_csv(index=False).encode())
+        stream = stream_predictions(source, predict_fn, chunk_size=2, schema_types=schema_types)
+        return b"".join([payload async for payload in stream])
+
+    output = pd.read_csv(io.BytesIO(asyncio.run(consume())))
+
+    assert len(scored_chunks) == 3
+    assert scored_chunks[0] == [np.int8] * 3
+    assert scored_chunks[-1] == [np.float32] * 3
+    assert output[PREDICTION_COLUMN_NAME].tolist() == [1] * 5
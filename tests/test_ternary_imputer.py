@@ -0,0 +1,44 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import KNNImputer
+
+from network_security.constant.training_pipeline import (
+    DATA_TRANSFORMATION_IMPUTER_PARAMS,
+    TARGET_COLUMN,
+)
+from network_security.utils.ml_utils.model.ternary_imputer import TernaryKNNImputer
+
+DATA_FILE_PATH = "Network_Data/phisingData.csv"
+## same bar as benchmark_inference.py, on a slice of the data to keep the test fast
+MIN_IMPUTER_IDENTICAL_SHARE = 0.90
+
+
+@pytest.fixture(scope="module")
+def holes() -> pd.DataFrame:
+    features = pd.read_csv(DATA_FILE_PATH).drop(columns=[TARGET_COLUMN]).head(3000)
+    rng = np.random.default_rng(0)
+    return features.mask(rng.random(features.shape) < 0.05)
+
+
+def test_imputes_like_knn_imputer(holes: pd.DataFrame) -> None:
+    expected = KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS).fit(holes).transform(holes)
+    imputed = TernaryKNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS).fit(holes).transform(holes)
+
+    missing = holes.isna().to_numpy()
+    np.testing.assert_array_equal(imputed[~missing], expected[~missing])
+    assert (imputed[missing] == expected[missing]).mean() >= MIN_IMPUTER_IDENTICAL_SHARE
+
+
+def test_pickling_keeps_the_imputer_usable(holes: pd.DataFrame) -> None:
+    imputer = TernaryKNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS).fit(holes)
+    query = holes.head(50)
+    expected = imputer.transform(query)
+
+    restored = pickle.loads(pickle.dumps(imputer))
+
+    ## the fitted imputer stays in use after it was saved (write-behind, model push)
+    np.testing.assert_array_equal(imputer.transform(query), expected)
+    np.testing.assert_array_equal(restored.transform(query), expected)
@@ -0,0 +1,26 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from network_security.pipeline.training_scheduler import TrainingJob, TrainingJobScheduler
+
+
+def test_crashed_worker_fails_its_job_and_replaces_the_pool() -> None:
+    scheduler = TrainingJobScheduler(max_concurrent=1, niceness=0, history_size=10)
+    scheduler.start()
+    try:
+        broken_pool = scheduler._pool
+        job = TrainingJob(job_id="crashed")
+        scheduler._jobs[job.job_id] = job
+        future = broken_pool.submit(os._exit, 1)
+        with pytest.raises(BrokenProcessPool):
+            future.result(timeout=60)
+
+        scheduler._on_done(job.job_id, future, broken_pool)
+
+        assert scheduler.get(job.job_id)["status"] == "failed"
+        assert scheduler._pool is not broken_pool
+        assert scheduler._pool.submit(os.getpid).result(timeout=60) != os.getpid()
+    finally:
+        scheduler.shutdown()